@@ -0,0 +1,154 @@
+# Перехват запросов вкладки через CDP Fetch: index.html, бандл, стили и vite.svg
+# отдаются из общего для всех браузеров процесса кеша в памяти, без обращения к серверу
+import asyncio
+import base64
+import hashlib
+import logging
+import threading
+import time
+import weakref
+from urllib.parse import urlsplit
+
+import event_backend
+from browser import create_chrome
+from static_server import HEALTH_PATH, ROOT, load_assets, resolve_asset
+
+_NOT_FOUND = base64.b64encode(b"not found").decode("ascii")
+
+logger = logging.getLogger(__name__)
+
+
+class AssetCache:
+    # Тела лежат по sha256 содержимого, маршруты ссылаются на хеш: "/" и "/index.html"
+    # хранятся один раз, base64 для Fetch.fulfillRequest считается заранее
+
+    def __init__(self, root=ROOT):
+        self.assets = {}
+        self.digests = {}
+        self.encoded = {}
+        blobs = {}
+        for path, asset in load_assets(root).items():
+            digest = hashlib.sha256(asset.body).hexdigest()
+            self.assets[path] = blobs.setdefault(digest, asset)
+            self.digests[asset.path] = digest
+        for digest, asset in blobs.items():
+            self.encoded[digest] = base64.b64encode(asset.body).decode("ascii")
+
+    def lookup(self, path):
+        asset = resolve_asset(self.assets, path)
+        if asset is None:
+            return None, None
+        return asset, self.digests[asset.path]
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_cache():
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = AssetCache()
+    return _shared
+
+
+class AssetInterceptor:
+    # Отвечает на Fetch.requestPaused в event loop сессии; записи о ресурсах
+    # копятся до drain(), который вызывается из потока теста
+
+    def __init__(self, session, base_url, cache):
+        self.session = session
+        self.cache = cache
+        self.records = []
+        self._lock = threading.Lock()
+        session.connection.on("Fetch.requestPaused", self._on_paused)
+        session.run(session.connection.send("Fetch.enable", {
+            "patterns": [{"urlPattern": base_url + "/*", "requestStage": "Request"}],
+        }))
+
+    def drain(self):
+        with self._lock:
+            records, self.records = self.records, []
+        return records
+
+    def _on_paused(self, params):
+        asyncio.ensure_future(self._answer(params))
+
+    async def _answer(self, params):
+        # Исключение в задаче без обработчика оставило бы запрос на паузе навсегда, а сама
+        # ошибка всплыла бы только как "Task exception was never retrieved". Такой запрос
+        # отпускаем на сервер и отмечаем в записях
+        try:
+            await self._handle(params)
+        except Exception as e:
+            url = params.get("request", {}).get("url")
+            logger.exception("asset cache failed to answer %s", url)
+            with self._lock:
+                self.records.append({"url": url, "type": params.get("resourceType"), "status": None,
+                                     "error": f"{type(e).__name__}: {e}"})
+            try:
+                await self.session.connection.send("Fetch.continueRequest", {"requestId": params["requestId"]})
+            except event_backend.CdpError:
+                logger.exception("could not release paused request %s", url)
+
+    async def _handle(self, params):
+        start = time.perf_counter()
+        request_id = params["requestId"]
+        url = params["request"]["url"]
+        path = urlsplit(url).path
+        send = self.session.connection.send
+        if path == HEALTH_PATH:
+            await send("Fetch.continueRequest", {"requestId": request_id})
+            return
+        asset, digest = self.cache.lookup(path)
+        if asset is None:
+            await send("Fetch.fulfillRequest", {
+                "requestId": request_id, "responseCode": 404, "body": _NOT_FOUND,
+                "responseHeaders": [{"name": "Content-Type", "value": "text/plain"}],
+            })
+            status, size = 404, 0
+        else:
+            await send("Fetch.fulfillRequest", {
+                "requestId": request_id,
+                "responseCode": 200,
+                "responseHeaders": [
+                    {"name": "Content-Type", "value": asset.content_type},
+                    {"name": "Cache-Control", "value": asset.cache_control},
+                    {"name": "ETag", "value": asset.etag},
+                ],
+                "body": self.cache.encoded[digest],
+            })
+            status, size = 200, len(asset.body)
+        record = {
+            "url": url,
+            "type": params.get("resourceType"),
+            "status": status,
+            "bytes": size,
+            "digest": digest,
+            "fulfill_ms": (time.perf_counter() - start) * 1000,
+        }
+        with self._lock:
+            self.records.append(record)
+
+
+_interceptors = weakref.WeakKeyDictionary()
+
+
+def attach(driver, base_url, cache=None):
+    interceptor = AssetInterceptor(event_backend.session_for(driver), base_url, cache or shared_cache())
+    _interceptors[driver] = interceptor
+    return interceptor
+
+
+def interceptor_for(driver):
+    return _interceptors.get(driver)
+
+
+def intercepting_factory(base_url, factory=create_chrome):
+    # Фабрика для BrowserPool: перехват включается до первой навигации браузера
+    def create():
+        driver = factory()
+        attach(driver, base_url)
+        return driver
+    return create
@@ -0,0 +1,141 @@
+# Кеш ассетов и перехват Fetch без браузера: маршруты, 404, /healthz, дедупликация и записи drain()
+import asyncio
+import base64
+import json
+import threading
+import unittest
+
+import pytest
+
+import asset_cache
+import event_backend
+from static_server import HEALTH_PATH, ROOT
+
+BASE_URL = "http://127.0.0.1:8000"
+JS_ASSET = "/assets/index-BUH56GOL.js"
+
+
+class FakeSocket:
+    # Вкладка без браузера: на любую команду отвечает пустым результатом и запоминает её
+    def __init__(self):
+        self.messages = asyncio.Queue()
+        self.sent = []
+        self._changed = asyncio.Condition()
+
+    async def send(self, raw):
+        message = json.loads(raw)
+        async with self._changed:
+            self.sent.append(message)
+            self._changed.notify_all()
+        await self.messages.put(json.dumps({"id": message["id"], "result": {}}))
+
+    async def pause(self, request_id, path):
+        await self.messages.put(json.dumps({"method": "Fetch.requestPaused", "params": {
+            "requestId": request_id, "request": {"url": BASE_URL + path}, "resourceType": "Document",
+        }}))
+
+    async def answers(self, count):
+        def answered():
+            return [message for message in self.sent if message["method"] != "Fetch.enable"]
+        async with self._changed:
+            await asyncio.wait_for(self._changed.wait_for(lambda: len(answered()) >= count), 2)
+        return {message["params"]["requestId"]: message for message in answered()}
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.messages.get()
+
+    async def close(self):
+        pass
+
+
+class FakeSession:
+    # Как DevToolsSession: свой event loop в фоновом потоке, сокет создаётся внутри него
+    timeout = 2
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+        self.connection = self.run(self._connect())
+        self.socket = self.connection.socket
+
+    async def _connect(self):
+        return event_backend.CdpConnection(FakeSocket())
+
+    run = event_backend.DevToolsSession.run
+
+    def close(self):
+        self.run(self.connection.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(self.timeout)
+
+
+class BrokenCache:
+    def lookup(self, path):
+        raise RuntimeError("broken")
+
+
+class AssetCacheTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cache = asset_cache.AssetCache(ROOT)
+
+    def test_routes_share_one_body_by_digest(self):
+        index, digest = self.cache.lookup("/")
+        self.assertIs(self.cache.lookup("/index.html")[0], index)
+        # SPA fallback: путь без расширения - тот же index.html
+        self.assertEqual(self.cache.lookup("/transfer/rub"), (index, digest))
+        self.assertEqual(len(self.cache.encoded), len(set(self.cache.digests.values())))
+        self.assertEqual(base64.b64decode(self.cache.encoded[digest]), index.body)
+
+    def test_missing_file_is_not_found(self):
+        self.assertEqual(self.cache.lookup("/assets/missing.js"), (None, None))
+
+
+class AssetInterceptorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.session = FakeSession()
+        self.socket = self.session.socket
+
+    def tearDown(self):
+        self.session.close()
+
+    def intercept(self, cache, *paths):
+        interceptor = asset_cache.AssetInterceptor(self.session, BASE_URL, cache)
+        for request_id, path in enumerate(paths):
+            self.session.run(self.socket.pause(str(request_id), path))
+        return interceptor, self.session.run(self.socket.answers(len(paths)))
+
+    def test_fulfills_assets_404_and_passes_healthz_through(self):
+        cache = asset_cache.AssetCache(ROOT)
+        interceptor, answers = self.intercept(cache, JS_ASSET, HEALTH_PATH, "/missing.js")
+
+        self.assertEqual(self.socket.sent[0]["params"]["patterns"][0]["urlPattern"], BASE_URL + "/*")
+        asset, digest = cache.lookup(JS_ASSET)
+        self.assertEqual(answers["0"]["method"], "Fetch.fulfillRequest")
+        self.assertEqual(answers["0"]["params"]["responseCode"], 200)
+        self.assertEqual(base64.b64decode(answers["0"]["params"]["body"]), asset.body)
+        self.assertEqual(answers["1"]["method"], "Fetch.continueRequest")
+        self.assertEqual(answers["2"]["params"]["responseCode"], 404)
+
+        records = sorted(interceptor.drain(), key=lambda record: record["url"])
+        self.assertEqual([(record["url"], record["status"], record["bytes"], record["digest"]) for record in records],
+                         [(BASE_URL + JS_ASSET, 200, len(asset.body), digest), (BASE_URL + "/missing.js", 404, 0, None)])
+        self.assertEqual(interceptor.drain(), [])
+
+    def test_failure_releases_the_request(self):
+        with self.assertLogs("asset_cache", level="ERROR"):
+            interceptor, answers = self.intercept(BrokenCache(), "/index.html")
+
+        self.assertEqual(answers["0"]["method"], "Fetch.continueRequest")
+        record, = interceptor.drain()
+        self.assertEqual((record["status"], record["error"]), (None, "RuntimeError: broken"))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
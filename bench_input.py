@@ -0,0 +1,195 @@
+# Бенчмарк отклика формы перевода на нажатия клавиш.
+# python bench_input.py --keystrokes 5000 --fields card,amount
+import argparse
+import json
+import os
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+import perf_stats
+from browser import create_chrome
+from pages import AMOUNT_INPUT, CARD_INPUT, DashboardPage
+from static_server import StaticServer
+
+FIELDS = {"card": CARD_INPUT, "amount": AMOUNT_INPUT}
+CARD_NUMBER = "1234567890123456"
+# Сколько цифр набираем в поле, прежде чем стереть их обратно
+FIELD_DIGITS = {"card": 16, "amount": 6}
+DRAIN_EVERY = 200
+
+# Для каждого keydown: timeStamp события, момент после обработчиков input
+# (значение уже переписано onChange), следующий кадр и перерисовка #comission.
+# Параллельно собираем Event Timing (>= 16 мс) и long tasks главного потока
+_INSTALL_JS = """
+if (window.__inputBench) { return; }
+const bench = window.__inputBench = {records: [], longTasks: [], slowEvents: [], current: null};
+document.addEventListener('keydown', event => {
+  const field = event.target.placeholder === '1000' ? 'amount' : 'card';
+  bench.current = {field: field, key: event.key, dispatch: event.timeStamp,
+                   dom: null, frame: null, commission: null};
+  bench.records.push(bench.current);
+}, true);
+window.addEventListener('input', () => {
+  const record = bench.current;
+  if (!record || record.dom !== null) { return; }
+  record.dom = performance.now();
+  requestAnimationFrame(() => { record.frame = performance.now(); });
+});
+const commissionObserver = new MutationObserver(() => {
+  const record = bench.current;
+  if (record && record.commission === null) { record.commission = performance.now(); }
+});
+const watchCommission = () => {
+  const commission = document.getElementById('comission');
+  if (commission && commission !== bench.commissionElement) {
+    bench.commissionElement = commission;
+    commissionObserver.disconnect();
+    commissionObserver.observe(commission, {childList: true, characterData: true, subtree: true});
+  }
+};
+new MutationObserver(watchCommission).observe(document.getElementById('root'), {childList: true, subtree: true});
+watchCommission();
+new PerformanceObserver(list => {
+  for (const entry of list.getEntries()) {
+    bench.longTasks.push({start: entry.startTime, duration: entry.duration});
+  }
+}).observe({type: 'longtask', buffered: true});
+new PerformanceObserver(list => {
+  for (const entry of list.getEntries()) {
+    bench.slowEvents.push({name: entry.name, duration: entry.duration,
+                           processing: entry.processingEnd - entry.processingStart});
+  }
+}).observe({type: 'event', buffered: true, durationThreshold: 16});
+"""
+
+# Два кадра ожидания: последней записи нужно успеть получить отметку frame
+_DRAIN_JS = """
+const bench = window.__inputBench;
+const done = arguments[arguments.length - 1];
+requestAnimationFrame(() => requestAnimationFrame(() => {
+  const result = {records: bench.records, longTasks: bench.longTasks, slowEvents: bench.slowEvents};
+  bench.records = []; bench.longTasks = []; bench.slowEvents = [];
+  done(result);
+}));
+"""
+
+_FOCUS_END_JS = """
+const input = arguments[0];
+input.focus();
+input.setSelectionRange(input.value.length, input.value.length);
+return input.value;
+"""
+
+
+def _key_event(key):
+    if key == "Backspace":
+        return {"key": "Backspace", "code": "Backspace", "windowsVirtualKeyCode": 8}
+    return {"key": key, "code": f"Digit{key}", "text": key, "windowsVirtualKeyCode": ord(key)}
+
+
+def press(driver, key):
+    # Через CDP, как настоящее нажатие: keydown -> input -> keyup в одном таске браузера
+    event = _key_event(key)
+    driver.execute_cdp_cmd("Input.dispatchKeyEvent", dict(event, type="keyDown"))
+    driver.execute_cdp_cmd("Input.dispatchKeyEvent", {k: v for k, v in dict(event, type="keyUp").items() if k != "text"})
+
+
+def keystroke_plan(field, keystrokes):
+    # Набираем цифры и стираем обратно, чтобы поле не росло бесконечно
+    digits = FIELD_DIGITS[field]
+    cycle = [str((index + 1) % 10) for index in range(digits)] + ["Backspace"] * digits
+    return [cycle[index % len(cycle)] for index in range(keystrokes)]
+
+
+def run_field(driver, form, field, keystrokes):
+    collected = {"records": [], "longTasks": [], "slowEvents": []}
+    # Фокус и каретка в конец; стартуем с пустого поля (в сумме по умолчанию 1000)
+    value = form.cache.use(FIELDS[field], lambda el: driver.execute_script(_FOCUS_END_JS, el))
+    for _ in value:
+        press(driver, "Backspace")
+    driver.execute_script(_INSTALL_JS)
+    for index, key in enumerate(keystroke_plan(field, keystrokes), start=1):
+        press(driver, key)
+        if index % DRAIN_EVERY == 0:
+            _merge(collected, driver.execute_async_script(_DRAIN_JS))
+    _merge(collected, driver.execute_async_script(_DRAIN_JS))
+    return collected
+
+
+def _merge(collected, batch):
+    for name in collected:
+        collected[name].extend(batch[name])
+
+
+def summarize_field(collected):
+    records = collected["records"]
+    latencies = {"dom_ms": [], "frame_ms": [], "commission_ms": []}
+    for record in records:
+        for name, key in (("dom_ms", "dom"), ("frame_ms", "frame"), ("commission_ms", "commission")):
+            if record[key] is not None:
+                latencies[name].append(record[key] - record["dispatch"])
+    long_tasks = [task["duration"] for task in collected["longTasks"]]
+    return {
+        "keystrokes": len(records),
+        "latency": {name: perf_stats.summarize(values) for name, values in latencies.items()},
+        "long_tasks": perf_stats.summarize(long_tasks),
+        "long_task_ms_total": sum(long_tasks),
+        "slow_events": perf_stats.summarize([event["duration"] for event in collected["slowEvents"]]),
+    }
+
+
+def run_benchmark(base_url, keystrokes, fields):
+    driver = create_chrome()
+    wait = WebDriverWait(driver, 10)
+    results = {}
+    try:
+        for field in fields:
+            page = DashboardPage(driver, wait, base_url).open(balance=30000, reserved=20001)
+            form = page.rubles_card.select()
+            if field == "amount":
+                form.enter_card(CARD_NUMBER)
+            results[field] = summarize_field(run_field(driver, form, field, keystrokes))
+    finally:
+        driver.quit()
+    return results
+
+
+def print_report(results):
+    print(f"{'field':<8} {'metric':<15} {'count':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for field, result in results.items():
+        rows = list(result["latency"].items()) + [("long_tasks", result["long_tasks"]),
+                                                   ("slow_events", result["slow_events"])]
+        for name, summary in rows:
+            if summary["count"]:
+                print(f"{field:<8} {name:<15} {summary['count']:>7} {summary['p50']:>8.2f} "
+                      f"{summary['p95']:>8.2f} {summary['p99']:>8.2f} {summary['max']:>8.2f}")
+            else:
+                print(f"{field:<8} {name:<15} {0:>7}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="F-Bank transfer form keystroke latency benchmark")
+    parser.add_argument("--keystrokes", type=int, default=2000, help="keystrokes per field")
+    parser.add_argument("--fields", default="card,amount", help="comma-separated subset of: card, amount")
+    parser.add_argument("--output", default=os.path.join("test-results", "bench-input.json"))
+    args = parser.parse_args(argv)
+
+    fields = [field for field in args.fields.split(",") if field]
+    unknown = set(fields) - set(FIELDS)
+    if unknown:
+        parser.error(f"unknown fields: {', '.join(sorted(unknown))}")
+
+    server = StaticServer().start()
+    try:
+        results = run_benchmark(server.base_url, args.keystrokes, fields)
+    finally:
+        server.stop()
+
+    print_report(results)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+# Нагрузочный режим: сотни одновременных пользователей (вкладок headless Chrome)
+# в пуле процессов проходят сценарий перевода, сервер считает свою нагрузку.
+# python bench_load.py --processes 8 --tabs 25 --iterations 20
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from selenium.common.exceptions import WebDriverException
+
+import perf_stats
+import transfer_model
+from browser import create_chrome
+from static_server import StaticServer
+
+CARD_NUMBER = "1234567890123456"
+BALANCE, RESERVED = 30000, 20001
+STEPS = ("open_ms", "select_ms", "card_ms", "amount_ms", "flow_ms")
+# Вкладки в фоне: без этих флагов Chrome душит их таймеры и отрисовку
+BACKGROUND_ARGUMENTS = (
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+)
+FLOW_TIMEOUT = 30
+# Сколько расхождений состояния сохранять в отчёт целиком
+MAX_MISMATCHES = 20
+
+FLOW_PARAMETER = "load_flow"
+
+# Ставится в каждую вкладку через Page.addScriptToEvaluateOnNewDocument. Навигация
+# запускается присваиванием location.href и сразу возвращает управление (page load
+# strategy "none"), поэтому вкладки процесса грузят страницу с сервера одновременно,
+# а не по очереди через блокирующий driver.get. Сценарий стартует в новом документе
+# сам, параметры - в query (приложение читает только balance и reserved). Шаги
+# отсчитываются от начала навигации (performance.now), ожидания - на MutationObserver
+_FLOW_JS = """
+(() => {
+  const raw = new URLSearchParams(location.search).get('%(parameter)s');
+  if (!raw) { return; }
+  const [card, amount, timeout] = raw.split(',');
+  const flow = window.__loadFlow = {done: false, error: null, steps: {}, commission: null, button: null};
+  const setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+  const mark = name => { flow.steps[name] = performance.now(); };
+  const type = (input, value) => {
+    setter.call(input, value);
+    input.dispatchEvent(new Event('input', {bubbles: true}));
+  };
+  const tick = () => new Promise(resolve => setTimeout(resolve, 0));
+  const until = check => new Promise((resolve, reject) => {
+    const found = check();
+    if (found) { resolve(found); return; }
+    const observer = new MutationObserver(() => {
+      const value = check();
+      if (value) { observer.disconnect(); clearTimeout(timer); resolve(value); }
+    });
+    const timer = setTimeout(() => { observer.disconnect(); reject(new Error('timeout')); }, Number(timeout));
+    observer.observe(document, {subtree: true, childList: true, characterData: true, attributes: true});
+  });
+  (async () => {
+    // На старте документа #root ещё нет: ждём, пока приложение смонтирует счёт
+    const rubSum = await until(() => document.getElementById('rub-sum'));
+    mark('open');
+    const root = document.getElementById('root');
+    rubSum.closest('.g-card').click();
+    const cardInput = await until(() => root.querySelector("input[placeholder='0000 0000 0000 0000']"));
+    mark('select');
+    type(cardInput, card);
+    const amountInput = await until(() => root.querySelector("input[placeholder='1000']"));
+    mark('card');
+    type(amountInput, amount);
+    await tick();
+    const commission = document.getElementById('comission');
+    flow.commission = commission ? commission.textContent : null;
+    flow.button = Array.from(root.querySelectorAll('button')).some(el => el.textContent.includes('Перевести'));
+    mark('amount');
+  })().catch(error => { flow.error = String(error); }).finally(() => { flow.done = true; });
+})();
+""" % {"parameter": FLOW_PARAMETER}
+
+# Старый документ ещё отвечает на команды, пока новый не загружен: его завершённый
+# сценарий не должен засчитаться за новый
+_NAVIGATE_JS = "window.__loadFlow = null; location.href = arguments[0];"
+_READ_FLOW_JS = "return window.__loadFlow && window.__loadFlow.done ? window.__loadFlow : null;"
+
+
+class UserTab:
+    # Один симулированный пользователь: своя вкладка, сценарий ставится в неё один раз
+
+    def __init__(self, driver, handle, base_url, rng):
+        self.driver = driver
+        self.handle = handle
+        self.base_url = base_url
+        self.rng = rng
+        self.amount = None
+        self.started = None
+        self.done = 0
+        driver.switch_to.window(handle)
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _FLOW_JS})
+
+    def start(self):
+        self.driver.switch_to.window(self.handle)
+        self.amount = self.rng.randint(1, 12000)
+        self.started = time.perf_counter()
+        flow = f"{CARD_NUMBER},{self.amount},{FLOW_TIMEOUT * 1000}"
+        url = f"{self.base_url}/?balance={BALANCE}&reserved={RESERVED}&{FLOW_PARAMETER}={flow}"
+        self.driver.execute_script(_NAVIGATE_JS, url)
+
+    def poll(self):
+        self.driver.switch_to.window(self.handle)
+        return self.driver.execute_script(_READ_FLOW_JS)
+
+
+def run_worker(base_url, tabs, iterations, seed):
+    # Выполняется в дочернем процессе: один Chrome, `tabs` вкладок, iterations сценариев на вкладку
+    rng = random.Random(seed)
+    samples = {step: [] for step in STEPS}
+    errors = {}
+    mismatches = []
+    completed = 0
+    driver = create_chrome(BACKGROUND_ARGUMENTS, page_load_strategy="none")
+    try:
+        handles = [driver.current_window_handle]
+        for _ in range(tabs - 1):
+            driver.switch_to.new_window("tab")
+            handles.append(driver.current_window_handle)
+        users = [UserTab(driver, handle, base_url, rng) for handle in handles]
+        pending = []
+        for user in users:
+            _safe_start(user, iterations, errors, pending)
+        while pending:
+            user = pending.pop(0)
+            try:
+                flow = user.poll()
+            except WebDriverException as e:
+                # Сценарий засчитывается ошибкой, а вкладка переходит к следующему, как при таймауте
+                _count(errors, "poll", e)
+            else:
+                if flow is None:
+                    if time.perf_counter() - user.started < FLOW_TIMEOUT:
+                        pending.append(user)
+                        continue
+                    _count(errors, "timeout")
+                elif _record(user, flow, samples, errors, mismatches):
+                    completed += 1
+            user.done += 1
+            if user.done < iterations:
+                _safe_start(user, iterations, errors, pending)
+    finally:
+        driver.quit()
+    return {"completed": completed, "samples": samples, "errors": errors, "mismatches": mismatches}
+
+
+def _safe_start(user, iterations, errors, pending):
+    try:
+        user.start()
+    except WebDriverException as e:
+        # Вкладка выбывает: её оставшиеся сценарии тоже ошибки, иначе error_rate занижен
+        _count(errors, "open", e)
+        lost = iterations - user.done - 1
+        if lost > 0:
+            _count(errors, "lost", count=lost)
+        return
+    pending.append(user)
+
+
+def _count(errors, step, exception=None, count=1):
+    key = step if exception is None else f"{step}: {type(exception).__name__}"
+    errors[key] = errors.get(key, 0) + count
+
+
+def _record(user, flow, samples, errors, mismatches):
+    # True - сценарий прошёл без ошибок и с ожидаемым состоянием; только такие идут в throughput
+    if flow["error"]:
+        _count(errors, f"flow: {flow['error']}")
+        return False
+    steps = flow["steps"]
+    samples["open_ms"].append(steps["open"])
+    samples["select_ms"].append(steps["select"] - steps["open"])
+    samples["card_ms"].append(steps["card"] - steps["select"])
+    samples["amount_ms"].append(steps["amount"] - steps["card"])
+    samples["flow_ms"].append(steps["amount"])
+    # Под нагрузкой форма должна считать так же, как в одиночку: сверяем с моделью бандла
+    expected = (str(transfer_model.app_commission(user.amount)),
+                transfer_model.app_can_transfer(BALANCE, RESERVED, user.amount))
+    actual = (flow["commission"], flow["button"])
+    if actual != expected:
+        _count(errors, "state")
+        if len(mismatches) < MAX_MISMATCHES:
+            mismatches.append({"amount": user.amount, "expected": expected, "actual": actual})
+        return False
+    return True
+
+
+def run_load(base_url, processes, tabs, iterations, seed=0):
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(run_worker, base_url, tabs, iterations, seed + index) for index in range(processes)]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+
+    samples = {step: [] for step in STEPS}
+    errors = {}
+    mismatches = []
+    completed = 0
+    for result in results:
+        completed += result["completed"]
+        mismatches.extend(result["mismatches"])
+        for step in STEPS:
+            samples[step].extend(result["samples"][step])
+        for key, count in result["errors"].items():
+            errors[key] = errors.get(key, 0) + count
+    attempted = processes * tabs * iterations
+    failed = sum(errors.values())
+    return {
+        "users": processes * tabs,
+        "attempted": attempted,
+        "completed": completed,
+        "elapsed_s": elapsed,
+        "throughput_per_s": completed / elapsed if elapsed else 0.0,
+        "error_rate": failed / attempted if attempted else 0.0,
+        "errors": errors,
+        "mismatches": mismatches[:MAX_MISMATCHES],
+        "latency": {step: perf_stats.summarize(values) for step, values in samples.items()},
+    }
+
+
+def print_report(result):
+    print(f"users={result['users']} flows={result['completed']}/{result['attempted']} "
+          f"elapsed={result['elapsed_s']:.1f}s throughput={result['throughput_per_s']:.1f}/s "
+          f"error_rate={result['error_rate']:.2%}")
+    print(f"{'step':<12} {'count':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for step, summary in result["latency"].items():
+        if summary["count"]:
+            print(f"{step:<12} {summary['count']:>7} {summary['p50']:>9.1f} {summary['p95']:>9.1f} "
+                  f"{summary['p99']:>9.1f} {summary['max']:>9.1f}")
+    for key, count in sorted(result["errors"].items()):
+        print(f"error {key}: {count}")
+    server = result.get("server")
+    if server:
+        latency = server["latency_ms"]
+        print(f"server requests={server['requests']} bytes={server['bytes_sent']} "
+              f"peak_in_flight={server['peak_in_flight']} statuses={server['by_status']}")
+        if latency["count"]:
+            print(f"server latency ms p50={latency['p50']:.2f} p95={latency['p95']:.2f} p99={latency['p99']:.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="F-Bank concurrent transfer flow load test")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="worker processes, one Chrome each")
+    parser.add_argument("--tabs", type=int, default=10, help="simulated users (tabs) per process")
+    parser.add_argument("--iterations", type=int, default=10, help="transfer flows per user")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=os.path.join("test-results", "bench-load.json"))
+    args = parser.parse_args(argv)
+
+    server = StaticServer().start()
+    server.metrics.reset()
+    try:
+        result = run_load(server.base_url, args.processes, args.tabs, args.iterations, args.seed)
+        result["server"] = server.metrics.snapshot()
+    finally:
+        server.stop()
+
+    print_report(result)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
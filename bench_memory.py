@@ -0,0 +1,201 @@
+# Профиль памяти SPA за длинную сессию: форма перевода прогоняется тысячи раз,
+# периодически снимаются куча JS, счётчики DOM-узлов и обработчиков событий.
+# python bench_memory.py --iterations 5000 --sample-every 50 --heap-snapshots
+import argparse
+import json
+import os
+
+import numpy as np
+from selenium.webdriver.support.ui import WebDriverWait
+
+import event_backend
+import perf_stats
+from browser import create_chrome
+from pages import DashboardPage
+from static_server import StaticServer
+
+CARD_NUMBER = "1234567890123456"
+AMOUNTS = ("55", "100", "999", "1000", "5000", "9091", "9999", "0", "12345", "1")
+SERIES = ("js_heap_used", "performance_memory_used", "dom_nodes", "listeners", "documents")
+# Без флага performance.memory округляется и обновляется раз в 20 минут
+PRECISE_MEMORY_ARGUMENTS = ("--enable-precise-memory-info",)
+# Типы узлов снимка кучи, которые группируются по имени конструктора
+NAMED_NODE_TYPES = ("object", "closure", "native")
+DETACHED_PREFIX = "Detached "
+
+_PERFORMANCE_MEMORY_JS = """
+const memory = performance.memory;
+return memory ? {used: memory.usedJSHeapSize, total: memory.totalJSHeapSize} : null;
+"""
+
+
+def sample_memory(driver):
+    # Перед замером собираем мусор, иначе в серии будет пила сборщика, а не утечка
+    driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+    heap = driver.execute_cdp_cmd("Runtime.getHeapUsage", {})
+    counters = driver.execute_cdp_cmd("Memory.getDOMCounters", {})
+    memory = driver.execute_script(_PERFORMANCE_MEMORY_JS)
+    return {
+        "js_heap_used": heap["usedSize"],
+        "js_heap_total": heap["totalSize"],
+        "performance_memory_used": memory["used"] if memory else None,
+        "dom_nodes": counters["nodes"],
+        "listeners": counters["jsEventListeners"],
+        "documents": counters["documents"],
+    }
+
+
+def run_iteration(page, index):
+    # Как test_13: несколько кликов по карточке подряд, затем карта и очередная сумма
+    form = page.rubles_card.select(times=1 + index % 3)
+    form.enter_card(CARD_NUMBER)
+    form.enter_amount(AMOUNTS[index % len(AMOUNTS)])
+
+
+def run_profile(page, iterations, sample_every, first_index=0):
+    samples = [dict(sample_memory(page.driver), iteration=0)]
+    for index in range(1, iterations + 1):
+        run_iteration(page, first_index + index)
+        if index % sample_every == 0:
+            samples.append(dict(sample_memory(page.driver), iteration=index))
+    return samples
+
+
+def analyze(samples):
+    report = {}
+    for name in SERIES:
+        values = [sample[name] for sample in samples if sample.get(name) is not None]
+        if len(values) < 2:
+            continue
+        report[name] = dict(perf_stats.growth(values), start=values[0], end=values[-1])
+    return report
+
+
+async def take_heap_snapshot(connection):
+    chunks = []
+
+    def on_chunk(params):
+        chunks.append(params["chunk"])
+    connection.on("HeapProfiler.addHeapSnapshotChunk", on_chunk)
+    try:
+        await connection.send("HeapProfiler.enable")
+        await connection.send("HeapProfiler.collectGarbage")
+        # Все куски приходят событиями до ответа на саму команду
+        await connection.send("HeapProfiler.takeHeapSnapshot", {"reportProgress": False})
+    finally:
+        connection.off("HeapProfiler.addHeapSnapshotChunk", on_chunk)
+    return json.loads("".join(chunks))
+
+
+def summarize_heap(snapshot):
+    # Узлы снимка - плоский массив по node_fields; группируем по конструктору
+    # (для object/closure/native) или по типу узла, считая штуки и собственный размер
+    meta = snapshot["snapshot"]["meta"]
+    fields = meta["node_fields"]
+    node_types = meta["node_types"][0]
+    strings = snapshot["strings"]
+    nodes = np.asarray(snapshot["nodes"], dtype=np.int64).reshape(-1, len(fields))
+    types = nodes[:, fields.index("type")]
+    names = nodes[:, fields.index("name")]
+    sizes = nodes[:, fields.index("self_size")]
+
+    named = np.isin(types, [node_types.index(kind) for kind in NAMED_NODE_TYPES if kind in node_types])
+    keys = np.where(named, names, -1 - types)
+    unique, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse)
+    totals = np.bincount(inverse, weights=sizes)
+    summary = {}
+    for key, count, total in zip(unique.tolist(), counts.tolist(), totals.tolist()):
+        label = strings[key] if key >= 0 else f"({node_types[-1 - key]})"
+        summary[label] = {"count": count, "self_size": int(total)}
+    return summary
+
+
+def diff_heap(before, after, top=20):
+    rows = []
+    for label in set(before) | set(after):
+        old = before.get(label, {"count": 0, "self_size": 0})
+        new = after.get(label, {"count": 0, "self_size": 0})
+        rows.append({
+            "constructor": label,
+            "count_delta": new["count"] - old["count"],
+            "size_delta": new["self_size"] - old["self_size"],
+            "count": new["count"],
+        })
+    rows.sort(key=lambda row: row["size_delta"], reverse=True)
+    detached = sum(row["count_delta"] for row in rows if row["constructor"].startswith(DETACHED_PREFIX))
+    return {
+        "size_delta": sum(row["size_delta"] for row in rows),
+        "count_delta": sum(row["count_delta"] for row in rows),
+        "detached_nodes_delta": detached,
+        "top": [row for row in rows if row["size_delta"] > 0 or row["count_delta"] > 0][:top],
+    }
+
+
+def run_benchmark(base_url, iterations, sample_every, warmup, heap_snapshots):
+    driver = create_chrome(PRECISE_MEMORY_ARGUMENTS)
+    wait = WebDriverWait(driver, 10)
+    result = {}
+    try:
+        driver.execute_cdp_cmd("HeapProfiler.enable", {})
+        session = event_backend.session_for(driver) if heap_snapshots else None
+        page = DashboardPage(driver, wait, base_url).open(balance=30000, reserved=20001)
+        # Прогрев не попадает ни в серию, ни в первый снимок: первая инициализация - не утечка
+        for index in range(warmup):
+            run_iteration(page, index)
+        before = None
+        if session is not None:
+            before = summarize_heap(session.run(take_heap_snapshot(session.connection), timeout=120))
+        samples = run_profile(page, iterations, sample_every, warmup)
+        result["samples"] = samples
+        result["growth"] = analyze(samples)
+        if session is not None:
+            after = summarize_heap(session.run(take_heap_snapshot(session.connection), timeout=120))
+            result["heap_diff"] = diff_heap(before, after)
+    finally:
+        event_backend.close_all()
+        driver.quit()
+    return result
+
+
+def print_report(result):
+    print(f"{'series':<24} {'start':>12} {'end':>12} {'slope':>10} {'p':>10}  verdict")
+    for name, trend in result["growth"].items():
+        verdict = "GROWING" if trend["growing"] else "stable"
+        print(f"{name:<24} {trend['start']:>12} {trend['end']:>12} {trend['slope']:>10.1f} "
+              f"{trend['p_value']:>10.2g}  {verdict}")
+    heap_diff = result.get("heap_diff")
+    if heap_diff:
+        print(f"heap snapshot diff: {heap_diff['size_delta']:+d} bytes, {heap_diff['count_delta']:+d} objects, "
+              f"{heap_diff['detached_nodes_delta']:+d} detached DOM nodes")
+        for row in heap_diff["top"]:
+            print(f"  {row['constructor'][:48]:<48} {row['count_delta']:>+8} {row['size_delta']:>+12}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="F-Bank transfer form memory profile")
+    parser.add_argument("--iterations", type=int, default=2000, help="transfer form iterations")
+    parser.add_argument("--sample-every", type=int, default=50, help="iterations between memory samples")
+    parser.add_argument("--warmup", type=int, default=50, help="iterations before the first sample")
+    parser.add_argument("--heap-snapshots", action="store_true",
+                        help="diff heap snapshots taken before and after the run (needs websockets)")
+    parser.add_argument("--output", default=os.path.join("test-results", "bench-memory.json"))
+    args = parser.parse_args(argv)
+
+    server = StaticServer().start()
+    try:
+        result = run_benchmark(server.base_url, args.iterations, args.sample_every, args.warmup,
+                               args.heap_snapshots)
+    finally:
+        server.stop()
+
+    print_report(result)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    # Ненулевой код возврата, чтобы режим можно было ставить в ночной CI
+    return 1 if any(trend["growing"] for trend in result["growth"].values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,165 @@
+# Бенчмарк загрузки F-Bank: холодный/тёплый кеш и троттлинг через Chrome DevTools Protocol.
+# python bench_page_load.py --iterations 30 --modes cold,warm,throttled
+import argparse
+import json
+import os
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+import page_timing
+import perf_stats
+from browser import create_chrome
+from static_server import StaticServer
+from waits import open_app
+
+MODES = ("cold", "warm", "throttled")
+METRICS = ("load_ms", "first_paint_ms", "rub_sum_rendered_ms", "interactive_form_ms")
+DEFAULT_PARAMS = ("30000:20001", "0:0", "999999:0", "abc:xyz")
+
+# latency (мс), download/upload (байт/с)
+NETWORK_PROFILES = {
+    "none": None,
+    "fast3g": (150, 1.6 * 1024 * 1024 / 8, 750 * 1024 / 8),
+    "slow3g": (400, 400 * 1024 / 8, 400 * 1024 / 8),
+}
+
+
+FORM_MARK = "transfer-form-interactive"
+
+# Время до рабочей формы перевода, а не только до баланса: как только появился #rub-sum,
+# скрипт сам выбирает "Рубли" и ставит отметку, когда отрисовано поле номера карты.
+# Клик идёт из страницы, поэтому в замер не попадают обращения WebDriver
+_FORM_MARK_JS = """
+new MutationObserver((mutations, observer) => {
+  const rubSum = document.getElementById('rub-sum');
+  if (!rubSum) { return; }
+  observer.disconnect();
+  const cardInput = () => document.querySelector("input[placeholder='0000 0000 0000 0000']");
+  new MutationObserver((formMutations, formObserver) => {
+    if (cardInput()) {
+      formObserver.disconnect();
+      performance.mark('%(mark)s');
+    }
+  }).observe(document, {childList: true, subtree: true});
+  rubSum.closest('.g-card').click();
+}).observe(document, {childList: true, subtree: true});
+""" % {"mark": FORM_MARK}
+
+_READ_FORM_MARK_JS = """
+const entry = performance.getEntriesByName('%s')[0];
+return entry ? entry.startTime : null;
+""" % FORM_MARK
+
+
+def install_form_mark(driver):
+    if getattr(driver, "_form_mark_installed", False):
+        return
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _FORM_MARK_JS})
+    driver._form_mark_installed = True
+
+
+def configure_mode(driver, mode, cpu_rate=4, network="fast3g"):
+    driver.execute_cdp_cmd("Network.enable", {})
+    throttled = mode == "throttled"
+    driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": cpu_rate if throttled else 1})
+    profile = NETWORK_PROFILES[network] if throttled else None
+    if profile is None:
+        conditions = {"offline": False, "latency": 0, "downloadThroughput": -1, "uploadThroughput": -1}
+    else:
+        latency, download, upload = profile
+        conditions = {"offline": False, "latency": latency,
+                      "downloadThroughput": download, "uploadThroughput": upload}
+    driver.execute_cdp_cmd("Network.emulateNetworkConditions", conditions)
+
+
+def measure_load(driver, wait, url, cold=False):
+    if cold:
+        driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+    open_app(driver, wait, url)
+    timings = page_timing.read_timings(driver)
+    timings["interactive_form_ms"] = wait.until(lambda d: d.execute_script(_READ_FORM_MARK_JS))
+    return timings
+
+
+def run_iterations(driver, wait, url, iterations, mode="warm"):
+    page_timing.install_marks(driver)
+    install_form_mark(driver)
+    if mode != "cold":
+        # Прогрев: первая загрузка кладёт бандл в кеш и не попадает в выборку
+        measure_load(driver, wait, url)
+    return [measure_load(driver, wait, url, cold=mode == "cold") for _ in range(iterations)]
+
+
+def summarize_samples(samples, metrics=METRICS):
+    return {
+        metric: perf_stats.summarize([sample[metric] for sample in samples if sample.get(metric) is not None])
+        for metric in metrics
+    }
+
+
+def run_benchmark(base_url, iterations, modes, params, cpu_rate, network):
+    driver = create_chrome()
+    wait = WebDriverWait(driver, 30)
+    results = []
+    try:
+        for mode in modes:
+            configure_mode(driver, mode, cpu_rate, network)
+            for param in params:
+                balance, reserved = param.split(":")
+                url = f"{base_url}/?balance={balance}&reserved={reserved}"
+                samples = run_iterations(driver, wait, url, iterations, mode)
+                results.append({
+                    "mode": mode,
+                    "balance": balance,
+                    "reserved": reserved,
+                    "samples": samples,
+                    "summary": summarize_samples(samples),
+                })
+    finally:
+        driver.quit()
+    return results
+
+
+def print_report(results):
+    print(f"{'mode':<10} {'params':<16} {'metric':<22} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for result in results:
+        params = f"{result['balance']}:{result['reserved']}"
+        for metric, summary in result["summary"].items():
+            if summary["count"]:
+                print(f"{result['mode']:<10} {params:<16} {metric:<22} "
+                      f"{summary['p50']:>9.1f} {summary['p95']:>9.1f} {summary['p99']:>9.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="F-Bank page load benchmark")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--modes", default=",".join(MODES),
+                        help="comma-separated subset of: " + ", ".join(MODES))
+    parser.add_argument("--params", default=",".join(DEFAULT_PARAMS),
+                        help="comma-separated balance:reserved pairs")
+    parser.add_argument("--cpu-throttle", type=float, default=4, help="CPU slowdown factor in throttled mode")
+    parser.add_argument("--network", choices=sorted(NETWORK_PROFILES), default="fast3g",
+                        help="network profile in throttled mode")
+    parser.add_argument("--output", default=os.path.join("test-results", "bench-page-load.json"))
+    args = parser.parse_args(argv)
+
+    modes = [mode for mode in args.modes.split(",") if mode]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(sorted(unknown))}")
+
+    server = StaticServer().start()
+    try:
+        results = run_benchmark(server.base_url, args.iterations, modes, args.params.split(","),
+                                args.cpu_throttle, args.network)
+    finally:
+        server.stop()
+
+    print_report(results)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# Запуск headless Chrome и пул прогретых сессий, переиспользуемых между тестами
+import threading
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+
+import page_timing
+from waits import dismiss_alert
+
+WINDOW_SIZE = (1280, 720)
+
+# about:blank и data: не дают доступа к storage, поэтому ошибки глушим в JS
+_CLEAR_STORAGE_JS = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+def create_chrome(arguments=(), page_load_strategy="normal"):
+    chrome_options = Options()
+    chrome_options.page_load_strategy = page_load_strategy
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument(f"--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}")
+    for argument in arguments:
+        chrome_options.add_argument(argument)
+    return webdriver.Chrome(options=chrome_options)
+
+
+def reset_session(driver):
+    # Не даём alert, storage и размер окна одного теста протечь в следующий
+    dismiss_alert(driver)
+    driver.execute_script(_CLEAR_STORAGE_JS)
+    driver.delete_all_cookies()
+    size = driver.get_window_size()
+    if (size["width"], size["height"]) != WINDOW_SIZE:
+        driver.set_window_size(*WINDOW_SIZE)
+
+
+class BrowserPool:
+    # Браузеры запускаются лениво и живут до close(); между тестами сессия
+    # только сбрасывается, это на порядки дешевле холодного старта Chrome
+
+    def __init__(self, factory=create_chrome):
+        self.factory = factory
+        self._idle = []
+        self._all = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        driver = self.factory()
+        # Отметка #rub-sum ставится до первой навигации: её может сделать уже подготовка теста
+        page_timing.install_marks(driver)
+        with self._lock:
+            self._all.append(driver)
+        return driver
+
+    def release(self, driver):
+        try:
+            reset_session(driver)
+        except WebDriverException:
+            # Сессия сломана (упал браузер/вкладка) - выбрасываем, следующий acquire поднимет новую
+            self._discard(driver)
+            return
+        with self._lock:
+            self._idle.append(driver)
+
+    def close(self):
+        with self._lock:
+            drivers, self._all, self._idle = self._all, [], []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
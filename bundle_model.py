@@ -0,0 +1,111 @@
+# Модель расчётов, извлечённая прямо из собранного бандла: шаг и ставка комиссии,
+# условие доступности перевода, разбор query-параметров и разделитель разрядов.
+# Нужна smoke-уровню: сверить transfer_model с бандлом без запуска браузера
+import math
+import os
+import re
+from collections import namedtuple
+from html.parser import HTMLParser
+
+import transfer_model
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+BundleModel = namedtuple("BundleModel", "commission_step commission_per_step strict query_defaults group_separator")
+
+# h=Math.floor(O/100)*10
+_COMMISSION_RE = re.compile(r"(\w+)=Math\.floor\((\w+)/(\d+)\)\*(\d+)")
+# A=o-s-h-O>0
+_AVAILABLE_RE = re.compile(r"\w+=(\w+)-(\w+)-(\w+)-(\w+)(>=?)0\b")
+# o=Number(i.get("balance")||"0")
+_QUERY_RE = re.compile(r'(\w+)=Number\(\w+\.get\("(balance|reserved)"\)\|\|"([^"]*)"\)')
+# .toString().replace(/\B(?=(\d{3})+(?!\d))/g,"'")
+_GROUPING_RE = re.compile(r'toString\(\)\.replace\(/\\B\(\?=\(\\d\{3\}\)\+\(\?!\\d\)\)/g,"([^"]*)"\)')
+
+
+class BundleShapeError(Exception):
+    pass
+
+
+class _IndexParser(HTMLParser):
+
+    def __init__(self):
+        super().__init__()
+        self.scripts = []
+        self.stylesheets = []
+        self.ids = []
+        self.title = ""
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if "id" in attrs:
+            self.ids.append(attrs["id"])
+        if tag == "script" and attrs.get("src"):
+            self.scripts.append(attrs)
+        elif tag == "link" and attrs.get("rel") == "stylesheet":
+            self.stylesheets.append(attrs)
+        self._in_title = tag == "title"
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+
+
+def parse_index(root=ROOT):
+    parser = _IndexParser()
+    with open(os.path.join(root, "index.html"), encoding="utf-8") as f:
+        parser.feed(f.read())
+    return parser
+
+
+def bundle_path(root=ROOT):
+    # Путь к JS-бандлу берём из index.html, а не из имени файла: хеш меняется с каждой сборкой
+    scripts = [attrs["src"] for attrs in parse_index(root).scripts if attrs.get("type") == "module"]
+    if len(scripts) != 1:
+        raise BundleShapeError(f"expected one module script in index.html, found {scripts}")
+    return os.path.join(root, scripts[0].lstrip("/"))
+
+
+def extract(source):
+    commission = _COMMISSION_RE.search(source)
+    available = _AVAILABLE_RE.search(source)
+    grouping = _GROUPING_RE.search(source)
+    queries = {name: (variable, default) for variable, name, default in _QUERY_RE.findall(source)}
+    if not (commission and available and grouping) or set(queries) != {"balance", "reserved"}:
+        raise BundleShapeError("commission, availability, query or formatting code not found in the bundle")
+    fee_var, amount_var, step, per_step = commission.groups()
+    balance_var, reserved_var, fee_used, amount_used, operator = available.groups()
+    # Выражение доступности должно ссылаться на те же переменные, что и разбор параметров и комиссия
+    if (balance_var, reserved_var, fee_used, amount_used) != (
+            queries["balance"][0], queries["reserved"][0], fee_var, amount_var):
+        raise BundleShapeError(f"availability expression {available.group(0)!r} does not match the parsed inputs")
+    return BundleModel(
+        commission_step=int(step),
+        commission_per_step=int(per_step),
+        strict=operator == ">",
+        query_defaults={name: default for name, (_, default) in queries.items()},
+        group_separator=grouping.group(1),
+    )
+
+
+def load(root=ROOT):
+    with open(bundle_path(root), encoding="utf-8") as f:
+        return extract(f.read())
+
+
+def commission(model, amount):
+    return math.floor(amount / model.commission_step) * model.commission_per_step
+
+
+def can_transfer(model, balance, reserved, amount):
+    margin = balance - reserved - commission(model, amount) - amount
+    return margin > 0 if model.strict else margin >= 0
+
+
+def query_number(model, name, raw):
+    return transfer_model.js_number(raw or model.query_defaults[name])
@@ -0,0 +1,256 @@
+# Табличный движок тест-кейсов: шаги из FIRST.md / SECOND.md / THIRD.md разбираются
+# в компактную таблицу действий, ожидания считает transfer_model (spec_*), а известные
+# расхождения приложения со спецификацией помечаются ID дефекта из тех же файлов
+import hashlib
+import json
+import os
+import re
+import uuid
+from collections import namedtuple
+from urllib.parse import parse_qs, urlsplit
+
+import transfer_model
+from batch_probe import probe_amounts
+from pages import DashboardPage
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CASE_FILES = ("FIRST.md", "SECOND.md", "THIRD.md")
+DEFAULT_QUERY = {"balance": "30000", "reserved": "20001"}
+
+Case = namedtuple("Case", "case_id title source actions bugs")
+
+# Метка документа, открытого исполнителем: пул делит браузер с другими тестами, и тот же
+# URL мог быть открыт заново кем-то ещё - тогда кеш элементов страницы устарел
+_MARK_DOCUMENT_JS = "window.__caseEngineToken = arguments[0];"
+_DOCUMENT_TOKEN_JS = "return window.__caseEngineToken || null;"
+
+_SECTION_RE = re.compile(r"^### ((?:TC|Bug)-\d+): (.+)$", re.MULTILINE)
+_STEP_RE = re.compile(r"^\s*\d+\.\s+(.+)$", re.MULTILINE)
+_URL_RE = re.compile(r"Открыть (https?://\S+)")
+_CARD_RE = re.compile(r"Ввести .*номер карты[^:]*:\s*([0-9A-Za-z ]+?)\s*(?:\(|$)")
+_AMOUNT_RE = re.compile(r"Ввести .*сумм[^:]*:\s*(-?[0-9.]+)")
+_SELECT_RE = re.compile(r"(Нажать|Выбрать).*(рублёвый счёт|\"Рубли\")")
+_TABLE_HEADER = ("balance", "reserved", "card", "amount")
+
+
+def parse_markdown(text, source):
+    # Секции без распознанных действий (ручные UI/UX-кейсы) в таблицу не попадают
+    cases = []
+    bugs = []
+    matches = list(_SECTION_RE.finditer(text))
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
+        body = text[match.end():end].split("\n## ", 1)[0]
+        case_id, title = match.group(1).upper(), match.group(2).strip()
+        if case_id.startswith("BUG"):
+            bugs.append(case_id)
+        actions = tuple(action for step in _STEP_RE.findall(body) for action in _parse_step(step))
+        if actions:
+            cases.append((case_id, title, source, actions))
+        cases.extend((f"{case_id}[{row}]", title, source, variant)
+                     for row, variant in enumerate(_parse_variants(body)))
+    return cases, bugs
+
+
+def _parse_step(step):
+    url = _URL_RE.search(step)
+    if url:
+        query = parse_qs(urlsplit(url.group(1)).query, keep_blank_values=True)
+        return [("open", tuple(sorted((name, values[0]) for name, values in query.items())))]
+    if _SELECT_RE.search(step):
+        return [("select", None)]
+    card = _CARD_RE.search(step)
+    if card:
+        return [("card", card.group(1).strip())]
+    amount = _AMOUNT_RE.search(step)
+    if amount:
+        return [("amount", amount.group(1))]
+    return []
+
+
+def _parse_variants(body):
+    # Таблица вариантов | balance | reserved | card | amount | под кейсом: строка = отдельный прогон
+    lines = [line.strip() for line in body.splitlines() if line.strip().startswith("|")]
+    if not lines:
+        return []
+    header = [cell.strip() for cell in lines[0].strip("|").split("|")]
+    if tuple(header) != _TABLE_HEADER:
+        return []
+    variants = []
+    for line in lines[2:]:
+        balance, reserved, card, amount = (cell.strip() for cell in line.strip("|").split("|"))
+        variants.append((
+            ("open", (("balance", balance), ("reserved", reserved))),
+            ("select", None),
+            ("card", card),
+            ("amount", amount),
+        ))
+    return variants
+
+
+_parsed = {}
+_cache_dir = None
+_parser_digest = None
+
+
+def configure_cache(directory):
+    # Каталог из config.cache (conftest); без него разбор кешируется только в памяти процесса
+    global _cache_dir
+    _cache_dir = None if directory is None else str(directory)
+
+
+def _parser_version():
+    # Правка регулярных выражений или разбора должна сбрасывать сохранённые разборы
+    global _parser_digest
+    if _parser_digest is None:
+        with open(os.path.abspath(__file__), "rb") as f:
+            _parser_digest = hashlib.sha256(f.read()).hexdigest()
+    return _parser_digest
+
+
+def _load_file(path):
+    # Разбор кешируется по sha256 файла и самого движка: в памяти процесса и в .pytest_cache между прогонами
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data + _parser_version().encode()).hexdigest()
+    if digest in _parsed:
+        return _parsed[digest]
+    cache_path = os.path.join(_cache_dir, f"{digest}.json") if _cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as f:
+            cached = json.load(f)
+        parsed = [_from_json(case) for case in cached["cases"]], cached["bugs"]
+    else:
+        parsed = parse_markdown(data.decode("utf-8"), os.path.basename(path))
+        if cache_path:
+            _write_atomic(cache_path, {"cases": parsed[0], "bugs": parsed[1]})
+    _parsed[digest] = parsed
+    return parsed
+
+
+def _write_atomic(path, value):
+    # Воркеры xdist собирают тесты одновременно: читатель видит либо старый файл, либо целый новый
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False)
+    os.replace(temporary, path)
+
+
+def _from_json(case):
+    case_id, title, source, actions = case
+    return case_id, title, source, tuple(
+        (kind, tuple(tuple(pair) for pair in value) if kind == "open" else value) for kind, value in actions
+    )
+
+
+def _case_paths(paths):
+    return [os.path.join(ROOT, name) for name in CASE_FILES] if paths is None else paths
+
+
+def load_bugs(paths=None):
+    # ID всех дефектов, описанных в markdown, в том числе без распознанных шагов
+    return {bug for path in _case_paths(paths) for bug in _load_file(path)[1]}
+
+
+def load_cases(paths=None):
+    paths = _case_paths(paths)
+    rows = []
+    known_bugs = set()
+    for path in paths:
+        cases, bugs = _load_file(path)
+        rows.extend(cases)
+        known_bugs.update(bugs)
+    return [Case(case_id, title, source, actions, _expected_bugs(actions, known_bugs))
+            for case_id, title, source, actions in rows]
+
+
+def _expected_bugs(actions, known_bugs):
+    # Какие известные дефекты помешают кейсу пройти, по расхождению модели бандла со спецификацией
+    bugs = []
+    state = dict(DEFAULT_QUERY)
+    for kind, value in actions:
+        if kind == "open":
+            state = dict(value)
+            raw = [state.get("balance"), state.get("reserved")]
+            if any(transfer_model.app_query_number(v) != transfer_model.spec_query_number(v) for v in raw):
+                bugs.append("BUG-003")
+        elif kind == "card":
+            digits = re.sub(r"\D", "", value)
+            if len(digits) > 16:
+                bugs.append("BUG-001")
+        elif kind == "amount":
+            if "." in value:
+                bugs.append("BUG-006")
+                continue
+            amount = transfer_model.js_number(value)
+            if amount < 0:
+                bugs.append("BUG-004")
+            elif amount == 0:
+                bugs.append("BUG-005")
+            elif transfer_model.app_commission(amount) != transfer_model.spec_commission(amount):
+                bugs.append("BUG-002")
+    return tuple(bug for bug in dict.fromkeys(bugs) if bug in known_bugs)
+
+
+class StepExecutor:
+    # Один исполнитель на браузер: повторное открытие того же URL в документе, который
+    # открыл сам исполнитель, не перезагружает страницу, а форма переиспользуется между кейсами
+
+    def __init__(self, driver, wait, base_url):
+        self.page = DashboardPage(driver, wait, base_url)
+        self.query = None
+        self.token = None
+        self.form = None
+
+    def run(self, case, check):
+        # check(actual, expected, what) решает, как сообщить о расхождении
+        self.check = check
+        self.form = None
+        opened = False
+        for kind, value in case.actions:
+            if kind == "open":
+                self._open(dict(value))
+                opened = True
+                continue
+            if not opened:
+                self._open(DEFAULT_QUERY)
+                opened = True
+            if kind == "select":
+                self._select()
+            elif kind == "card":
+                self._card(value)
+            elif kind == "amount":
+                self._amount(value)
+
+    def _open(self, query):
+        query_string = "?" + "&".join(f"{name}={value}" for name, value in query.items()) if query else ""
+        driver = self.page.driver
+        if query != self.query or driver.execute_script(_DOCUMENT_TOKEN_JS) != self.token:
+            self.page.open_url(query_string)
+            self.query = query
+            self.token = uuid.uuid4().hex
+            driver.execute_script(_MARK_DOCUMENT_JS, self.token)
+        self.form = None
+        raw = [query.get("balance"), query.get("reserved")]
+        self.available = tuple(transfer_model.spec_query_number(v) for v in raw)
+        self.check(self.page.rub_sum(), transfer_model.format_balance(self.available[0]), "balance")
+
+    def _select(self):
+        if self.form is None:
+            self.form = self.page.rubles_card.select()
+
+    def _card(self, value):
+        self._select()
+        self.form.enter_card(value)
+        digits = re.sub(r"\D", "", value)
+        expected = " ".join(digits[i:i + 4] for i in range(0, min(len(digits), 16), 4))
+        self.check(self.form.card_value(), expected, "card number")
+        self.check(self.form.amount_shown(), len(digits) >= 16, "amount field shown")
+
+    def _amount(self, value):
+        probe, = probe_amounts(self.page.driver, [value])
+        balance, reserved = self.available
+        amount = transfer_model.js_number(value)
+        self.check(probe.value, value, "amount value")
+        self.check(probe.commission, str(transfer_model.spec_commission(amount)), "commission")
+        self.check(probe.button_enabled, transfer_model.spec_can_transfer(balance, reserved, amount), "transfer allowed")
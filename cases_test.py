@@ -0,0 +1,129 @@
+# Data-driven tests generated from the test cases in FIRST.md / SECOND.md / THIRD.md
+import weakref
+from selenium.webdriver.support.ui import WebDriverWait
+import pytest
+import case_engine
+
+_executors = weakref.WeakKeyDictionary()
+
+
+def _load_cases(config):
+    # Кеш разбора markdown - в .pytest_cache через config.cache (нет при -p no:cacheprovider)
+    cache = getattr(config, "cache", None)
+    case_engine.configure_cache(cache.mkdir("case-engine") if cache is not None else None)
+    # Кейсы с одинаковым URL идут подряд, чтобы исполнитель не перезагружал страницу
+    return sorted(case_engine.load_cases(), key=lambda case: [str(action) for action in case.actions if action[0] == "open"][:1])
+
+
+def pytest_generate_tests(metafunc):
+    if "case" in metafunc.fixturenames:
+        metafunc.parametrize("case", [_param(case) for case in _load_cases(metafunc.config)])
+
+
+def _param(case):
+    marks = [pytest.mark.xfail(reason="Известный баг: " + ", ".join(case.bugs))] if case.bugs else []
+    return pytest.param(case, id=case.case_id, marks=marks)
+
+
+@pytest.fixture
+def executor(pooled_driver, base_url):
+    if pooled_driver not in _executors:
+        _executors[pooled_driver] = case_engine.StepExecutor(pooled_driver, WebDriverWait(pooled_driver, 10), base_url)
+    return _executors[pooled_driver]
+
+
+def test_every_documented_bug_is_covered(request):
+    documented = case_engine.load_bugs()
+    covered = {bug for case in _load_cases(request.config) for bug in case.bugs}
+    assert documented <= covered, f"Нет кейса для {sorted(documented - covered)}"
+
+
+SAMPLE = """
+## Кейсы
+
+### TC-101: Перевод с комиссией
+1. Открыть http://localhost:5173/?balance=10000&reserved=0
+2. Нажать на рублёвый счёт
+3. Ввести номер карты: 1234 5678 9012 3456
+4. Ввести сумму: 5000
+5. Проверить комиссию
+
+| balance | reserved | card | amount |
+|---------|----------|------|--------|
+| 10000 | 0 | 1234567890123456 | 150 |
+| abc | 0 | 1234567890123456 | 100.50 |
+
+### Bug-002: Комиссия для малых сумм
+1. Ввести номер карты: 1234567890123456
+2. Ввести сумму: 55
+
+### Bug-003: NaN в балансе
+1. Открыть http://localhost:5173/?balance=abc&reserved=xyz
+
+### Bug-004: Отрицательная сумма
+1. Ввести сумму: -100
+
+### Bug-006: Дробная сумма
+1. Ввести дробную сумму: 100.50
+
+### Bug-009: Ручная проверка контраста
+1. Проверить контрастность текста
+"""
+
+
+def test_parse_markdown_steps_and_variants():
+    cases, bugs = case_engine.parse_markdown(SAMPLE, "SAMPLE.md")
+    by_id = {case_id: actions for case_id, title, source, actions in cases}
+
+    assert bugs == ["BUG-002", "BUG-003", "BUG-004", "BUG-006", "BUG-009"]
+    # Ручной кейс без распознанных шагов в таблицу не попадает
+    assert sorted(by_id) == ["BUG-002", "BUG-003", "BUG-004", "BUG-006", "TC-101", "TC-101[0]", "TC-101[1]"]
+    assert by_id["TC-101"] == (
+        ("open", (("balance", "10000"), ("reserved", "0"))),
+        ("select", None),
+        ("card", "1234 5678 9012 3456"),
+        ("amount", "5000"),
+    )
+    assert by_id["TC-101[1]"] == (
+        ("open", (("balance", "abc"), ("reserved", "0"))),
+        ("select", None),
+        ("card", "1234567890123456"),
+        ("amount", "100.50"),
+    )
+    assert by_id["BUG-004"] == (("amount", "-100"),)
+
+
+def test_expected_bugs_follow_the_model(tmp_path):
+    path = tmp_path / "SAMPLE.md"
+    path.write_text(SAMPLE, encoding="utf-8")
+    cases = {case.case_id: case for case in case_engine.load_cases([str(path)])}
+
+    assert case_engine.load_bugs([str(path)]) == {"BUG-002", "BUG-003", "BUG-004", "BUG-006", "BUG-009"}
+    assert cases["TC-101"].source == "SAMPLE.md"
+    assert cases["TC-101"].bugs == ()
+    assert cases["TC-101[0]"].bugs == ("BUG-002",)
+    assert cases["TC-101[1]"].bugs == ("BUG-003", "BUG-006")
+    assert cases["BUG-002"].bugs == ("BUG-002",)
+    assert cases["BUG-004"].bugs == ("BUG-004",)
+    assert cases["BUG-006"].bugs == ("BUG-006",)
+
+
+def test_expected_bugs_only_name_documented_defects(tmp_path):
+    path = tmp_path / "ONLY.md"
+    path.write_text(SAMPLE.split("### Bug-")[0], encoding="utf-8")
+    cases = {case.case_id: case for case in case_engine.load_cases([str(path)])}
+
+    assert case_engine.load_bugs([str(path)]) == set()
+    assert cases["TC-101[0]"].bugs == ()
+    assert cases["TC-101[1]"].bugs == ()
+
+
+def test_markdown_case(case, executor):
+    def check(actual, expected, what):
+        assert actual == expected, f"{case.case_id} ({case.source}): {what} should be {expected!r}, got {actual!r}"
+
+    executor.run(case, check)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
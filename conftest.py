@@ -0,0 +1,130 @@
+import os
+
+import pytest
+
+from static_server import StaticServer
+
+pytest_plugins = ["perf_plugin", "result_cache", "trace_plugin"]
+
+# Selenium, websockets и page objects импортируются в фикстурах и хуках, которым они
+# нужны: smoke-уровень не должен платить за их загрузку
+BACKENDS = ("webdriver", "cdp")
+
+
+def _page_class(backend):
+    if backend == "cdp":
+        from event_backend import EventDashboardPage
+        return EventDashboardPage
+    from pages import DashboardPage
+    return DashboardPage
+
+
+def pytest_addoption(parser):
+    parser.addoption("--backend", choices=BACKENDS, default=os.environ.get("BANK_BACKEND", "webdriver"),
+                     help="how page objects read the page: WebDriver commands or CDP events (default: webdriver)")
+    parser.addoption("--asset-cache", action="store_true", default=bool(os.environ.get("BANK_ASSET_CACHE")),
+                     help="serve index.html and assets from an in-memory cache via CDP Fetch instead of the server")
+    parser.addoption("--visual-baseline", default=os.environ.get("BANK_VISUAL_BASELINE", "visual-baseline"),
+                     help="directory of the visual regression index (default: visual-baseline)")
+    parser.addoption("--visual-update", action="store_true",
+                     help="record screenshots into --visual-baseline instead of comparing")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "scenario(balance, reserved, select, card): shared page preconditions")
+    config.addinivalue_line("markers", "mutates_page: test leaves the page unusable for the next scenario")
+    config.addinivalue_line("markers", "smoke: static build and model check, runs before any browser starts")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection_modifyitems(config, items):
+    if any(item.get_closest_marker("scenario") is not None for item in items):
+        import scenarios
+        for item in items:
+            marker = item.get_closest_marker("scenario")
+            if marker is not None:
+                # Под `--dist loadgroup` тесты одного URL попадают в один воркер
+                item.add_marker(pytest.mark.xdist_group(scenarios.group_name(scenarios.scenario_from_marker(marker))))
+        items[:] = scenarios.schedule(items)
+    yield
+    # После всех плагинов (в том числе result_cache): smoke-тесты всегда идут первыми,
+    # пул браузеров создаётся лениво, поэтому до их окончания Chrome не запускается
+    items.sort(key=lambda item: item.get_closest_marker("smoke") is None)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if report.failed and item.get_closest_marker("smoke") is not None:
+        item.session.shouldstop = f"smoke test failed: {item.nodeid}"
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    # `-n auto`: по умолчанию по числу ядер, BANK_TEST_WORKERS переопределяет
+    workers = os.environ.get("BANK_TEST_WORKERS")
+    if workers:
+        return int(workers)
+    return os.cpu_count() or 1
+
+
+@pytest.fixture(scope="session")
+def browser_pool(request, base_url):
+    import event_backend
+    from browser import BrowserPool, create_chrome
+    factory = create_chrome
+    if request.config.getoption("asset_cache"):
+        import asset_cache
+        factory = asset_cache.intercepting_factory(base_url)
+    pool = BrowserPool(factory)
+    yield pool
+    event_backend.close_all()
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def base_url():
+    # BANK_BASE_URL позволяет гонять тесты против уже запущенного сервера
+    external = os.environ.get("BANK_BASE_URL")
+    if external:
+        yield external.rstrip("/")
+        return
+    server = StaticServer().start()
+    yield server.base_url
+    server.stop()
+
+
+@pytest.fixture
+def pooled_driver(request, browser_pool, base_url):
+    from selenium.webdriver.support.ui import WebDriverWait
+    driver = browser_pool.acquire()
+    if request.cls is not None:
+        request.cls.driver = driver
+        request.cls.wait = WebDriverWait(driver, 10)
+        request.cls.base_url = base_url
+    yield driver
+    browser_pool.release(driver)
+
+
+@pytest.fixture
+def scenario(request, pooled_driver, base_url):
+    # Страница с выполненными предусловиями @pytest.mark.scenario в self.page;
+    # без маркера - просто page object, а сохранённое состояние сбрасывается
+    import scenarios
+    from selenium.webdriver.support.ui import WebDriverWait
+    runner = scenarios.runner_for(pooled_driver, base_url, _page_class(request.config.getoption("backend")))
+    wait = getattr(request.cls, "wait", None) or WebDriverWait(pooled_driver, 10)
+    marker = request.node.get_closest_marker("scenario")
+    if marker is None:
+        page = runner.page
+        page.wait = wait
+    else:
+        page = runner.prepare(scenarios.scenario_from_marker(marker), wait)
+    if request.cls is not None:
+        request.cls.page = page
+    yield page
+    if marker is None:
+        runner.invalidate()
+    else:
+        runner.finish(isolated=request.node.get_closest_marker("mutates_page") is not None)
@@ -0,0 +1,333 @@
+# Событийный бэкенд поверх Chrome DevTools Protocol (asyncio).
+# MutationObserver в странице сам присылает состояние #rub-sum, #comission, полей формы
+# и кнопки "Перевести" через Runtime.addBinding: тесты ждут изменения, а не опрашивают DOM
+import asyncio
+import json
+import threading
+import urllib.request
+import weakref
+
+try:
+    import websockets
+except ImportError:  # нужен только для --backend cdp
+    websockets = None
+
+from pages import AMOUNT_INPUT, DashboardPage, TransferForm
+
+BINDING = "__bankStateChanged"
+DEFAULT_TIMEOUT = 10
+
+# Ставится и в текущий документ, и в каждый новый (Page.addScriptToEvaluateOnNewDocument).
+# На старте документа #root ещё нет, поэтому наблюдаем за всем document
+_WATCH_JS = """
+(() => {
+  if (window.__bankWatch) { return; }
+  const text = id => {
+    const el = document.getElementById(id);
+    return el ? el.textContent.trim() : null;
+  };
+  const input = placeholder => {
+    const el = document.querySelector(`#root input[placeholder="${placeholder}"]`);
+    return el ? el.value : null;
+  };
+  const snapshot = () => {
+    const button = Array.from(document.querySelectorAll('#root button'))
+      .find(el => el.textContent.includes('Перевести'));
+    return {
+      url: location.href,
+      rubSum: text('rub-sum'),
+      rubReserved: text('rub-reserved'),
+      commission: text('comission'),
+      card: input('0000 0000 0000 0000'),
+      amount: input('1000'),
+      button: button ? (button.disabled ? 'disabled' : 'enabled') : null,
+    };
+  };
+  let last = null;
+  let scheduled = false;
+  const report = () => {
+    scheduled = false;
+    const state = JSON.stringify(snapshot());
+    if (state !== last) {
+      last = state;
+      window.%(binding)s(state);
+    }
+  };
+  // Значение controlled input меняется свойством, а не атрибутом: его ловим по input,
+  // после того как React обработает событие
+  const schedule = () => {
+    if (!scheduled) { scheduled = true; setTimeout(report, 0); }
+  };
+  window.__bankWatch = {snapshot: snapshot};
+  new MutationObserver(schedule).observe(document, {
+    subtree: true, childList: true, characterData: true, attributes: true,
+  });
+  document.addEventListener('input', schedule, true);
+  schedule();
+})();
+""" % {"binding": BINDING}
+
+_SNAPSHOT_EXPRESSION = "window.__bankWatch ? window.__bankWatch.snapshot() : null"
+
+
+class CdpError(Exception):
+    pass
+
+
+class CdpConnection:
+    # Одно websocket-соединение с вкладкой: ответы на команды по id, события подписчикам
+
+    def __init__(self, socket):
+        self.socket = socket
+        self._next_id = 0
+        self._pending = {}
+        self._listeners = {}
+        self._reader = asyncio.ensure_future(self._read())
+
+    @classmethod
+    async def connect(cls, ws_url):
+        return cls(await websockets.connect(ws_url, max_size=None))
+
+    def on(self, method, callback):
+        self._listeners.setdefault(method, []).append(callback)
+
+    def off(self, method, callback):
+        self._listeners.get(method, []).remove(callback)
+
+    async def send(self, method, params=None):
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[self._next_id] = future
+        await self.socket.send(json.dumps({"id": self._next_id, "method": method, "params": params or {}}))
+        return await future
+
+    async def close(self):
+        self._reader.cancel()
+        await self.socket.close()
+
+    async def _read(self):
+        try:
+            async for raw in self.socket:
+                message = json.loads(raw)
+                if "id" in message:
+                    future = self._pending.pop(message["id"], None)
+                    if future is None or future.done():
+                        continue
+                    if "error" in message:
+                        future.set_exception(CdpError(message["error"].get("message", message["error"])))
+                    else:
+                        future.set_result(message.get("result", {}))
+                else:
+                    for callback in self._listeners.get(message.get("method"), []):
+                        callback(message.get("params", {}))
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CdpError("DevTools connection closed"))
+            self._pending.clear()
+
+
+class StateWatcher:
+    # Последнее присланное страницей состояние + ожидание изменений без опроса
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.state = None
+        self.console = []
+        self._changed = asyncio.Condition()
+        connection.on("Runtime.bindingCalled", self._on_binding)
+        connection.on("Runtime.consoleAPICalled", self._on_console)
+        connection.on("Runtime.exceptionThrown", self._on_exception)
+
+    async def install(self):
+        await self.connection.send("Runtime.enable")
+        await self.connection.send("Runtime.addBinding", {"name": BINDING})
+        await self.connection.send("Page.addScriptToEvaluateOnNewDocument", {"source": _WATCH_JS})
+        await self.connection.send("Runtime.evaluate", {"expression": _WATCH_JS})
+
+    async def snapshot(self):
+        # Ответ приходит по тому же соединению после всех ранее отправленных
+        # страницей событий, поэтому это ещё и барьер для self.state
+        result = await self.connection.send("Runtime.evaluate", {
+            "expression": _SNAPSHOT_EXPRESSION, "returnByValue": True,
+        })
+        state = result["result"].get("value")
+        if state is None:
+            await self.connection.send("Runtime.evaluate", {"expression": _WATCH_JS})
+            return await self.snapshot()
+        await self._publish(state)
+        return state
+
+    async def until(self, predicate, timeout=DEFAULT_TIMEOUT):
+        state = await self.snapshot()
+        if predicate(state):
+            return state
+        async with self._changed:
+            await asyncio.wait_for(self._changed.wait_for(lambda: predicate(self.state)), timeout)
+            return self.state
+
+    async def _publish(self, state):
+        async with self._changed:
+            self.state = state
+            self._changed.notify_all()
+
+    def _on_binding(self, params):
+        if params.get("name") == BINDING:
+            asyncio.ensure_future(self._publish(json.loads(params["payload"])))
+
+    def _on_console(self, params):
+        text = " ".join(str(arg.get("value", arg.get("description", ""))) for arg in params.get("args", []))
+        self.console.append((params.get("type"), text))
+
+    def _on_exception(self, params):
+        details = params.get("exceptionDetails", {})
+        exception = details.get("exception", {})
+        self.console.append(("exception", exception.get("description", details.get("text", ""))))
+
+
+class DevToolsSession:
+    # Синхронный фасад для unittest-тестов: свой event loop в фоновом потоке и одно
+    # соединение с вкладкой на драйвер, общее для наблюдателя и перехвата запросов
+
+    def __init__(self, driver, timeout=DEFAULT_TIMEOUT):
+        if websockets is None:
+            raise RuntimeError("DevTools sessions require the 'websockets' package")
+        self.timeout = timeout
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="cdp-session", daemon=True)
+        self._thread.start()
+        self.connection = self.run(CdpConnection.connect(page_websocket_url(driver)))
+
+    def run(self, coroutine, timeout=None):
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        return future.result(self.timeout if timeout is None else timeout)
+
+    def close(self):
+        try:
+            self.run(self.connection.close())
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(self.timeout)
+
+
+class EventBackend:
+
+    def __init__(self, session):
+        self.session = session
+        self.timeout = session.timeout
+        self.watcher = session.run(self._install())
+
+    async def _install(self):
+        watcher = StateWatcher(self.session.connection)
+        await watcher.install()
+        return watcher
+
+    def snapshot(self):
+        return self.session.run(self.watcher.snapshot())
+
+    def until(self, predicate, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        return self.session.run(self.watcher.until(predicate, timeout), timeout + 1)
+
+    def gather(self, *predicates, timeout=None):
+        # Несколько ожиданий в одной сессии одновременно, общий таймаут на все
+        # asyncio.gather создаётся внутри loop сессии: run_coroutine_threadsafe принимает только корутину
+        timeout = self.timeout if timeout is None else timeout
+
+        async def waits():
+            return await asyncio.gather(*(self.watcher.until(predicate, timeout) for predicate in predicates))
+        return self.session.run(waits(), timeout + 1)
+
+    def console_messages(self):
+        return list(self.watcher.console)
+
+
+def page_websocket_url(driver):
+    # chromedriver сообщает адрес DevTools своего Chrome; подключаемся к той же вкладке
+    address = driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+    with urllib.request.urlopen(f"http://{address}/json/list", timeout=DEFAULT_TIMEOUT) as response:
+        targets = json.load(response)
+    current = driver.current_url
+    pages = [target for target in targets if target.get("type") == "page"]
+    for target in pages:
+        if target.get("url") == current:
+            return target["webSocketDebuggerUrl"]
+    return pages[0]["webSocketDebuggerUrl"]
+
+
+_sessions = weakref.WeakKeyDictionary()
+_backends = weakref.WeakKeyDictionary()
+
+
+def session_for(driver):
+    if driver not in _sessions:
+        _sessions[driver] = DevToolsSession(driver)
+    return _sessions[driver]
+
+
+def backend_for(driver):
+    if driver not in _backends:
+        _backends[driver] = EventBackend(session_for(driver))
+    return _backends[driver]
+
+
+def close_all():
+    sessions = list(_sessions.values())
+    _sessions.clear()
+    _backends.clear()
+    for session in sessions:
+        session.close()
+
+
+class EventDashboardPage(DashboardPage):
+    # Адаптер: тот же page object, но чтение состояния - из событий страницы,
+    # одна команда DevTools вместо find_element + get_attribute на каждое поле
+
+    def __init__(self, driver, wait, base_url):
+        super().__init__(driver, wait, base_url)
+        self.backend = backend_for(driver)
+
+    def rub_sum(self):
+        return self.backend.snapshot()["rubSum"]
+
+    def rub_reserved(self):
+        return self.backend.snapshot()["rubReserved"]
+
+    @property
+    def transfer_form(self):
+        return EventTransferForm(self)
+
+
+class EventTransferForm(TransferForm):
+
+    def __init__(self, page):
+        super().__init__(page)
+        self.backend = page.backend
+
+    def card_value(self):
+        return self.backend.snapshot()["card"]
+
+    def amount_value(self):
+        return self.backend.snapshot()["amount"]
+
+    def amount_shown(self):
+        return self.backend.snapshot()["amount"] is not None
+
+    def commission(self):
+        return self.backend.snapshot()["commission"]
+
+    def enter_amount(self, amount, clear=True, expect_commission_change=False):
+        if not expect_commission_change:
+            return super().enter_amount(amount, clear)
+        before = self.commission()
+
+        def _type(amount_input):
+            if clear:
+                amount_input.clear()
+            amount_input.send_keys(amount)
+        self._input(AMOUNT_INPUT, _type)
+        return self.backend.until(lambda state: state["commission"] != before)["commission"]
+
+    def transfer_state(self):
+        # None - кнопки нет, иначе 'enabled' / 'disabled'
+        return self.backend.snapshot()["button"]
@@ -0,0 +1,123 @@
+# Tests for the DevTools event backend: concurrent waits (gather), console, button state
+import asyncio
+import json
+import threading
+import unittest
+import pytest
+
+import event_backend
+
+
+class FakeSocket:
+    # Вкладка без браузера: на snapshot отвечает текущим состоянием, а изменения
+    # присылает событиями Runtime.bindingCalled, как MutationObserver страницы
+    def __init__(self, state):
+        self.state = state
+        self.messages = asyncio.Queue()
+
+    async def send(self, raw):
+        message = json.loads(raw)
+        result = {}
+        if message["method"] == "Runtime.evaluate" and message["params"].get("returnByValue"):
+            result = {"result": {"value": dict(self.state)}}
+        await self.messages.put(json.dumps({"id": message["id"], "result": result}))
+
+    async def emit(self, method, params):
+        await self.messages.put(json.dumps({"method": method, "params": params}))
+
+    async def change(self, **fields):
+        self.state.update(fields)
+        await self.emit("Runtime.bindingCalled", {"name": event_backend.BINDING, "payload": json.dumps(self.state)})
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.messages.get()
+
+    async def close(self):
+        pass
+
+
+class FakeSession:
+    # Как DevToolsSession: свой event loop в фоновом потоке, но соединение с FakeSocket.
+    # Сокет создаётся внутри loop: в Python 3.9 asyncio.Queue привязывается к текущему loop
+    timeout = 2
+
+    def __init__(self, state):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+        self.connection = self.run(self._connect(state))
+        self.socket = self.connection.socket
+
+    async def _connect(self, state):
+        return event_backend.CdpConnection(FakeSocket(state))
+
+    run = event_backend.DevToolsSession.run
+
+    def close(self):
+        self.run(self.connection.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(self.timeout)
+
+
+class EventBackendModelTests(unittest.TestCase):
+
+    def setUp(self):
+        self.session = FakeSession({"commission": "0", "amount": "", "button": None})
+        self.socket = self.session.socket
+        self.backend = event_backend.EventBackend(self.session)
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_gather_waits_for_all_conditions_concurrently(self):
+        async def react():
+            await asyncio.sleep(0.05)
+            await self.socket.change(amount="5000")
+            await self.socket.change(commission="500", button="enabled")
+        asyncio.run_coroutine_threadsafe(react(), self.session.loop)
+
+        states = self.backend.gather(lambda state: state["amount"] == "5000",
+                                     lambda state: state["commission"] == "500",
+                                     lambda state: state["button"] == "enabled")
+
+        self.assertEqual(len(states), 3)
+        self.assertEqual(states[-1], {"commission": "500", "amount": "5000", "button": "enabled"})
+
+    def test_gather_times_out_when_one_condition_never_holds(self):
+        with self.assertRaises(asyncio.TimeoutError):
+            self.backend.gather(lambda state: state["commission"] == "0",
+                                lambda state: state["button"] == "disabled", timeout=0.2)
+
+    def test_console_messages_collect_logs_and_exceptions(self):
+        self.session.run(self.socket.emit("Runtime.consoleAPICalled", {"type": "log", "args": [{"value": "ready"}]}))
+        self.session.run(self.socket.emit("Runtime.exceptionThrown",
+                                          {"exceptionDetails": {"exception": {"description": "TypeError: x"}}}))
+        self.backend.snapshot()  # ответ приходит после событий
+
+        self.assertEqual(self.backend.console_messages(), [("log", "ready"), ("exception", "TypeError: x")])
+
+
+@pytest.mark.usefixtures("scenario")
+@pytest.mark.scenario(balance=30000, reserved=20001, card="1234567890123456")
+class EventBackendBrowserTests(unittest.TestCase):
+
+    def test_commission_amount_and_button_together(self):
+        # Бэкенд подключается к той же вкладке при любом --backend
+        backend = event_backend.backend_for(self.driver)
+        self.page.transfer_form.enter_amount("5000")
+
+        amount, commission, button = backend.gather(lambda state: state["amount"] == "5000",
+                                                    lambda state: state["commission"] == "500",
+                                                    lambda state: state["button"] is not None)
+
+        self.assertEqual(button["button"], "enabled")
+        self.assertEqual(event_backend.EventDashboardPage(self.driver, self.wait, self.base_url)
+                         .transfer_form.transfer_state(), "enabled")
+        self.assertEqual([text for kind, text in backend.console_messages() if kind == "exception"], [])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,93 @@
+# Automated checks of transfer_model.py: fast sweep in Python, confirmation in the browser
+import math
+import unittest
+import pytest
+import transfer_model
+from batch_probe import probe_amounts
+from pages import DashboardPage
+
+CARD_NUMBER = "1234567890123456"
+
+
+class TransferModelTests(unittest.TestCase):
+
+    def test_commission_matches_bundle_formula(self):
+        self.assertEqual(transfer_model.app_commission(55), 0)
+        self.assertEqual(transfer_model.app_commission(199), 10)
+        self.assertEqual(transfer_model.app_commission(5000), 500)
+        self.assertEqual(transfer_model.app_commission(-100), -10)
+        self.assertEqual(transfer_model.spec_commission(55), 5)
+        self.assertEqual(transfer_model.spec_commission(199), 19)
+
+    def test_can_transfer_boundaries(self):
+        # TC-004 / TC-005: доступно 9 999
+        self.assertTrue(transfer_model.app_can_transfer(30000, 20001, 5000))
+        self.assertFalse(transfer_model.app_can_transfer(30000, 20001, 9500))
+        # Остаток ровно 0 приложение не пропускает: 9100 + 910 = 10010
+        self.assertFalse(transfer_model.app_can_transfer(10010, 0, 9100))
+        # TC-009: 9091 + 909 = 10000 ровно равно доступной сумме
+        self.assertTrue(transfer_model.spec_can_transfer(10000, 0, 9091))
+
+    def test_format_balance(self):
+        self.assertEqual(transfer_model.format_balance(0), "0")
+        self.assertEqual(transfer_model.format_balance(999999), "999'999")
+        self.assertEqual(transfer_model.format_balance(50000), "50'000")
+        self.assertEqual(transfer_model.format_balance(float("nan")), "NaN")
+
+    def test_js_number_infinity_and_missing_query(self):
+        self.assertEqual(transfer_model.js_number(" -Infinity "), -math.inf)
+        self.assertEqual(transfer_model.js_number("+Infinity"), math.inf)
+        # Number("+-Infinity") и Number("--Infinity") в JS - NaN
+        for text in ("+-Infinity", "--Infinity", "++Infinity", "infinity"):
+            self.assertTrue(math.isnan(transfer_model.js_number(text)), text)
+        self.assertEqual(transfer_model.app_query_number(None), 0)
+        self.assertEqual(transfer_model.app_query_number(""), 0)
+        self.assertEqual(transfer_model.spec_query_number("--Infinity"), 0)
+
+    def test_vectorized_sweep_agrees_with_scalar_model(self):
+        result = transfer_model.sweep(count=2_000_000)
+        points = transfer_model.representative_points(result)
+
+        self.assertTrue(result["kinds"]["commission_mismatch"].any())
+        self.assertTrue(result["kinds"]["exact_balance"].any())
+        for balance, reserved, amount in points:
+            fee = transfer_model.app_commission(amount)
+            ok = transfer_model.app_can_transfer(balance, reserved, amount)
+            index = ((result["balance"] == balance) & (result["reserved"] == reserved)
+                     & (result["amount"] == amount)).argmax()
+            self.assertEqual(int(result["app_commission"][index]), fee)
+            self.assertEqual(bool(result["app_can_transfer"][index]), ok)
+
+
+@pytest.mark.usefixtures("pooled_driver")
+class TransferModelBrowserTests(unittest.TestCase):
+
+    def open_transfer_form(self, balance, reserved):
+        page = DashboardPage(self.driver, self.wait, self.base_url).open(balance=balance, reserved=reserved)
+        return page.rubles_card.select().enter_card(CARD_NUMBER)
+
+    def test_representative_points_match_browser(self):
+        points = transfer_model.representative_points(transfer_model.sweep())
+        for balance, reserved, amount in points:
+            with self.subTest(balance=balance, reserved=reserved, amount=amount):
+                self.open_transfer_form(balance, reserved)
+                probe, = probe_amounts(self.driver, [amount])
+
+                self.assertEqual(probe.commission, str(transfer_model.app_commission(amount)))
+                self.assertEqual(probe.button_shown, transfer_model.app_can_transfer(balance, reserved, amount))
+
+    def test_commission_boundaries_batch(self):
+        self.open_transfer_form(10000, 0)
+        amounts = list(range(0, 2000)) + list(range(9080, 9120))
+        probes = probe_amounts(self.driver, amounts)
+
+        mismatches = [
+            probe for amount, probe in zip(amounts, probes)
+            if probe.commission != str(transfer_model.app_commission(amount))
+            or probe.button_shown != transfer_model.app_can_transfer(10000, 0, amount)
+        ]
+        self.assertEqual(mismatches, [])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
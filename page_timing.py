@@ -0,0 +1,44 @@
+# Navigation / Paint Timing страницы и отметка появления #rub-sum
+RUB_SUM_MARK = "rub-sum-rendered"
+
+# Ставится до скриптов страницы: отмечаем момент появления #rub-sum
+_RUB_SUM_MARK_JS = """
+new MutationObserver((mutations, observer) => {
+  if (document.getElementById('rub-sum')) {
+    performance.mark('%s');
+    observer.disconnect();
+  }
+}).observe(document, {childList: true, subtree: true});
+""" % RUB_SUM_MARK
+
+_PAGE_TIMINGS_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+const paint = name => {
+  const entry = performance.getEntriesByName(name)[0];
+  return entry ? entry.startTime : null;
+};
+if (!nav) { return null; }
+return {
+  ttfb_ms: nav.responseStart - nav.startTime,
+  dom_content_loaded_ms: nav.domContentLoadedEventEnd - nav.startTime,
+  load_ms: nav.loadEventEnd > 0 ? nav.loadEventEnd - nav.startTime : null,
+  first_paint_ms: paint('first-paint'),
+  first_contentful_paint_ms: paint('first-contentful-paint'),
+  rub_sum_rendered_ms: paint('%s'),
+  transfer_bytes: nav.transferSize,
+  time_origin: performance.timeOrigin,
+};
+""" % RUB_SUM_MARK
+
+
+def install_marks(driver):
+    # Один раз на сессию: скрипт выполняется во всех последующих документах
+    if getattr(driver, "_rub_sum_mark_installed", False) or not hasattr(driver, "execute_cdp_cmd"):
+        return
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _RUB_SUM_MARK_JS})
+    driver._rub_sum_mark_installed = True
+
+
+def read_timings(driver):
+    # Тайминги последней навигации
+    return driver.execute_script(_PAGE_TIMINGS_JS) or {}
@@ -0,0 +1,193 @@
+# Page objects F-Bank: локаторы по id/CSS и кеш найденных элементов на загрузку страницы
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from waits import COMMISSION, RUB_SUM, open_app, text_changed, wait_for_render
+
+TITLE = (By.CSS_SELECTOR, "h1")
+RUB_RESERVED = (By.ID, "rub-reserved")
+CARD_INPUT = (By.CSS_SELECTOR, "input[placeholder='0000 0000 0000 0000']")
+AMOUNT_INPUT = (By.CSS_SELECTOR, "input[placeholder='1000']")
+TRANSFER_BUTTON = (By.XPATH, "//button[contains(., 'Перевести')]")
+# Карточка счёта - ближайший g-card вокруг #rub-sum, ищем относительно него
+CARD_CONTAINER = (By.XPATH, "./ancestor::div[contains(@class, 'g-card')][1]")
+
+# Один проход по #root вместо глобального XPath по всему DOM
+_ERROR_ELEMENTS_JS = """
+const root = document.getElementById('root');
+if (!root) { return []; }
+return Array.from(root.querySelectorAll('*')).filter(el =>
+  (el.className && String(el.className).includes('error')) ||
+  Array.from(el.childNodes).some(n => n.nodeType === Node.TEXT_NODE &&
+    /ошибка|неверн/.test(n.textContent)));
+"""
+
+
+class ElementCache:
+    # Элементы живут до навигации: open() сбрасывает кеш целиком, а устаревший
+    # после перерисовки React элемент перезапрашивается при первом обращении
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._elements = {}
+
+    def get(self, locator, parent=None):
+        key = (locator, parent)
+        element = self._elements.get(key)
+        if element is None:
+            context = self.driver if parent is None else self.get(*parent)
+            element = context.find_element(*locator)
+            self._elements[key] = element
+        return element
+
+    def wait_for(self, wait, locator):
+        # Ожидание нужно только для ещё не найденного элемента
+        element = self._elements.get((locator, None))
+        if element is None:
+            element = wait.until(EC.presence_of_element_located(locator))
+            self._elements[(locator, None)] = element
+        return element
+
+    def use(self, locator, action, parent=None):
+        try:
+            return action(self.get(locator, parent))
+        except StaleElementReferenceException:
+            # Вместе с элементом мог устареть и родитель, от которого его ищем
+            self.forget(locator, parent)
+            if parent is not None:
+                self.forget(*parent)
+            return action(self.get(locator, parent))
+
+    def forget(self, locator, parent=None):
+        self._elements.pop((locator, parent), None)
+        if parent is not None:
+            self._elements.pop(parent, None)
+
+    def clear(self):
+        self._elements.clear()
+
+
+class DashboardPage:
+
+    def __init__(self, driver, wait, base_url):
+        self.driver = driver
+        self.wait = wait
+        self.base_url = base_url
+        self.cache = ElementCache(driver)
+
+    def open(self, balance=30000, reserved=20001):
+        self.cache.clear()
+        open_app(self.driver, self.wait, f"{self.base_url}/?balance={balance}&reserved={reserved}")
+        return self
+
+    def open_url(self, query):
+        self.cache.clear()
+        open_app(self.driver, self.wait, f"{self.base_url}/{query}")
+        return self
+
+    def title(self):
+        return self.cache.use(TITLE, lambda el: el.text)
+
+    def title_displayed(self):
+        return self.cache.use(TITLE, lambda el: el.is_displayed())
+
+    def rub_sum(self):
+        return self.cache.use(RUB_SUM, lambda el: el.text)
+
+    def rub_reserved(self):
+        return self.cache.use(RUB_RESERVED, lambda el: el.text)
+
+    def balance_displayed(self):
+        return (self.cache.use(RUB_SUM, lambda el: el.is_displayed())
+                and self.cache.use(RUB_RESERVED, lambda el: el.is_displayed()))
+
+    @property
+    def rubles_card(self):
+        return RublesCard(self)
+
+    @property
+    def transfer_form(self):
+        return TransferForm(self)
+
+
+class RublesCard:
+
+    def __init__(self, page):
+        self.page = page
+        self.cache = page.cache
+
+    def element(self):
+        return self.cache.get(CARD_CONTAINER, parent=(RUB_SUM, None))
+
+    def is_displayed(self):
+        return self.cache.use(CARD_CONTAINER, lambda el: el.is_displayed(), parent=(RUB_SUM, None))
+
+    def select(self, times=1):
+        # Через cache.use: устаревшую после перерисовки карточку перезапрашиваем,
+        # а повтор докликивает только оставшиеся клики
+        clicks = [0]
+
+        def _click(card):
+            card = self.page.wait.until(EC.element_to_be_clickable(card))
+            while clicks[0] < times:
+                card.click()
+                clicks[0] += 1
+        self.cache.use(CARD_CONTAINER, _click, parent=(RUB_SUM, None))
+        return self.page.transfer_form
+
+
+class TransferForm:
+
+    def __init__(self, page):
+        self.page = page
+        self.driver = page.driver
+        self.cache = page.cache
+
+    def _input(self, locator, action):
+        self.cache.wait_for(self.page.wait, locator)
+        return self.cache.use(locator, action)
+
+    def enter_card(self, number, clear=True, per_key=False):
+        def _type(card_input):
+            if clear:
+                card_input.clear()
+            for chunk in (number if per_key else [number]):
+                card_input.send_keys(chunk)
+        self._input(CARD_INPUT, _type)
+        wait_for_render(self.driver)
+        return self
+
+    def card_value(self):
+        return self._input(CARD_INPUT, lambda el: el.get_attribute("value"))
+
+    def amount_shown(self):
+        return len(self.driver.find_elements(*AMOUNT_INPUT)) > 0
+
+    def amount_displayed(self):
+        return self._input(AMOUNT_INPUT, lambda el: el.is_displayed())
+
+    def enter_amount(self, amount, clear=True, expect_commission_change=False):
+        def _type(amount_input):
+            if clear:
+                amount_input.clear()
+            amount_input.send_keys(amount)
+        before = self.commission() if expect_commission_change else None
+        self._input(AMOUNT_INPUT, _type)
+        if expect_commission_change:
+            return self.page.wait.until(text_changed(COMMISSION, before))
+        wait_for_render(self.driver)
+        return self.commission()
+
+    def amount_value(self):
+        return self._input(AMOUNT_INPUT, lambda el: el.get_attribute("value"))
+
+    def commission(self):
+        return self.cache.use(COMMISSION, lambda el: el.text)
+
+    def transfer_buttons(self):
+        # Кнопка появляется и исчезает при каждом вводе суммы, её не кешируем
+        return self.driver.find_elements(*TRANSFER_BUTTON)
+
+    def error_elements(self):
+        return self.driver.execute_script(_ERROR_ELEMENTS_JS)
@@ -0,0 +1,245 @@
+# pytest-плагин: замеры каждого теста (Navigation/Paint Timing, команды WebDriver,
+# ожидания) в test-results/ и сравнение с сохранённым baseline
+import csv
+import json
+import os
+import statistics
+import time
+import weakref
+
+import pytest
+
+import page_timing
+import perf_stats
+
+BASELINE_HISTORY = 20
+# Метрика -> минимальный абсолютный прирост (мс), ниже которого разница не считается регрессией
+REGRESSION_METRICS = {
+    "duration_ms": 100.0,
+    "command_ms": 100.0,
+    "wait_ms": 100.0,
+    "ttfb_ms": 20.0,
+    "dom_content_loaded_ms": 50.0,
+    "first_contentful_paint_ms": 50.0,
+    "rub_sum_rendered_ms": 50.0,
+}
+CSV_FIELDS = ["test", "outcome", "commands"] + list(REGRESSION_METRICS)
+
+# performance.timeOrigin документа, на котором закончился предыдущий тест этого драйвера
+_last_documents = weakref.WeakKeyDictionary()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("perf", "per-test performance metrics")
+    group.addoption("--perf-dir", default="test-results",
+                    help="directory for perf.json / perf.csv (default: test-results)")
+    group.addoption("--perf-baseline", default=None,
+                    help="baseline JSON to compare against; regressions fail the run")
+    group.addoption("--perf-update-baseline", action="store_true",
+                    help="append this run's samples to --perf-baseline")
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(PerfReporter(config), "perf-reporter")
+
+
+class CommandRecorder:
+    # Подменяет execute() у конкретного драйвера на время теста: через него
+    # проходят все команды WebDriver, включая find_element и execute_script
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.by_command = {}
+        self._original = driver.execute
+
+    def __enter__(self):
+        def execute(driver_command, params=None):
+            start = time.perf_counter()
+            try:
+                return self._original(driver_command, params)
+            finally:
+                count, total = self.by_command.get(driver_command, (0, 0.0))
+                self.by_command[driver_command] = (count + 1, total + (time.perf_counter() - start) * 1000)
+        self.driver.execute = execute
+        return self
+
+    def __exit__(self, *exc_info):
+        del self.driver.execute
+
+    @property
+    def count(self):
+        return sum(count for count, _ in self.by_command.values())
+
+    @property
+    def total_ms(self):
+        return sum(total for _, total in self.by_command.values())
+
+
+class WaitRecorder:
+    # Подменяет until/until_not у класса WebDriverWait на время теста, как trace_plugin:
+    # так учитываются и ожидания, созданные самим тестом, page objects или case_engine
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self._originals = {}
+
+    def __enter__(self):
+        from selenium.webdriver.support.ui import WebDriverWait
+        for name in ("until", "until_not"):
+            self._originals[name] = getattr(WebDriverWait, name)
+            setattr(WebDriverWait, name, self._timed(self._originals[name]))
+        return self
+
+    def __exit__(self, *exc_info):
+        from selenium.webdriver.support.ui import WebDriverWait
+        for name, original in self._originals.items():
+            setattr(WebDriverWait, name, original)
+        self._originals = {}
+
+    def _timed(self, method):
+        def timed(wait, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(wait, *args, **kwargs)
+            finally:
+                self.count += 1
+                self.total_ms += (time.perf_counter() - start) * 1000
+        return timed
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    driver = item.funcargs.get("pooled_driver")
+    if driver is None:
+        start = time.perf_counter()
+        yield
+        item.user_properties.append(("perf", {"duration_ms": (time.perf_counter() - start) * 1000}))
+        return
+
+    start = time.perf_counter()
+    with CommandRecorder(driver) as commands, WaitRecorder() as waits:
+        yield
+    duration_ms = (time.perf_counter() - start) * 1000
+    record = {
+        "duration_ms": duration_ms,
+        "commands": commands.count,
+        "command_ms": commands.total_ms,
+        "by_command": {name: {"count": count, "ms": total} for name, (count, total) in commands.by_command.items()},
+        "waits": waits.count,
+        "wait_ms": waits.total_ms,
+    }
+    try:
+        timings = page_timing.read_timings(driver)
+    except Exception:
+        timings = {}
+    # Навигация идёт в фикстуре scenario или не идёт вовсе, если форма восстановлена на месте.
+    # Тайминги записываем, только если документ сменился с конца предыдущего теста,
+    # иначе это загрузка чужого теста
+    origin = timings.pop("time_origin", None)
+    record["navigated"] = origin is not None and origin != _last_documents.get(driver)
+    if record["navigated"]:
+        record.update(timings)
+    _last_documents[driver] = origin
+    # asset_cache тянет websockets и page objects, поэтому импорт - только для тестов с браузером
+    import asset_cache
+    interceptor = asset_cache.interceptor_for(driver)
+    if interceptor is not None:
+        # Ресурсы, отданные из кеша с конца предыдущего теста (включая подготовку этого)
+        record["resources"] = interceptor.drain()
+    item.user_properties.append(("perf", record))
+
+
+class PerfReporter:
+    # Работает и под xdist: записи приезжают в контроллер через user_properties отчёта
+
+    def __init__(self, config):
+        self.config = config
+        self.records = {}
+        self.regressions = []
+        self.sign_test = None
+        self.run_regression = False
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "call":
+            return
+        for name, value in report.user_properties:
+            if name == "perf":
+                self.records[report.nodeid] = dict(value, test=report.nodeid, outcome=report.outcome)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_sessionfinish(self, session):
+        if hasattr(self.config, "workerinput") or not self.records:
+            return
+        self._write_results()
+        baseline_path = self.config.getoption("perf_baseline")
+        if not baseline_path:
+            return
+        baseline = _load_baseline(baseline_path)
+        if self.config.getoption("perf_update_baseline"):
+            _update_baseline(baseline, self.records.values())
+            with open(baseline_path, "w", encoding="utf-8") as f:
+                json.dump(baseline, f, indent=2, sort_keys=True)
+            return
+        self._compare(baseline)
+        if self.regressions or self.run_regression:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.records or hasattr(self.config, "workerinput"):
+            return
+        terminalreporter.write_sep("-", "performance")
+        terminalreporter.write_line(f"{len(self.records)} tests recorded in {self.config.getoption('perf_dir')}/perf.json")
+        if self.sign_test is not None:
+            slower, total, p_value = self.sign_test
+            terminalreporter.write_line(f"slower than baseline median: {slower}/{total} tests (sign test p={p_value:.4f})",
+                                        red=self.run_regression)
+        for test, metric, value, median in self.regressions:
+            terminalreporter.write_line(f"REGRESSION {test} {metric}: {value:.1f} ms (baseline median {median:.1f} ms)", red=True)
+
+    def _write_results(self):
+        directory = self.config.getoption("perf_dir")
+        os.makedirs(directory, exist_ok=True)
+        records = sorted(self.records.values(), key=lambda record: record["test"])
+        with open(os.path.join(directory, "perf.json"), "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=2, ensure_ascii=False)
+        with open(os.path.join(directory, "perf.csv"), "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(records)
+
+    def _compare(self, baseline):
+        slower = total = 0
+        for test, record in self.records.items():
+            history = baseline["tests"].get(test, {})
+            for metric, min_delta in REGRESSION_METRICS.items():
+                samples = history.get(metric, [])
+                value = record.get(metric)
+                if perf_stats.is_regression(value, samples, min_delta=min_delta):
+                    self.regressions.append((test, metric, value, statistics.median(samples)))
+            durations = history.get("duration_ms", [])
+            if durations:
+                total += 1
+                slower += record["duration_ms"] > statistics.median(durations)
+        # По одному тесту шум велик, но систематическое замедление большинства тестов значимо
+        if total:
+            p_value = perf_stats.sign_test_p_value(slower, total)
+            self.sign_test = (slower, total, p_value)
+            self.run_regression = total >= 8 and p_value < 0.01
+
+
+def _load_baseline(path):
+    if not os.path.exists(path):
+        return {"tests": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _update_baseline(baseline, records):
+    for record in records:
+        history = baseline["tests"].setdefault(record["test"], {})
+        for metric in REGRESSION_METRICS:
+            if record.get(metric) is not None:
+                samples = history.setdefault(metric, [])
+                samples.append(record[metric])
+                del samples[:-BASELINE_HISTORY]
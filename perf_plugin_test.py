@@ -0,0 +1,116 @@
+# perf_plugin на отдельных прогонах pytester: запись baseline, сравнение с ним и учёт ожиданий
+import json
+
+import pytest
+
+import perf_plugin
+
+pytest_plugins = ["pytester"]
+pytestmark = pytest.mark.smoke
+
+CONFTEST = """
+import pytest
+
+
+class FakeDriver:
+    def execute(self, driver_command, params=None):
+        return {"value": None}
+
+    def execute_script(self, script, *args):
+        raise RuntimeError("no page")
+
+
+@pytest.fixture
+def pooled_driver():
+    return FakeDriver()
+"""
+
+
+@pytest.fixture
+def run(pytester):
+    pytester.makeconftest(CONFTEST)
+
+    def run(*args):
+        return pytester.runpytest_inprocess("-p", "perf_plugin", "-p", "no:xdist", "--perf-dir", "results", *args)
+    return run
+
+
+def write_baseline(pytester, tests):
+    path = pytester.path / "baseline.json"
+    path.write_text(json.dumps({"tests": tests}))
+    return path
+
+
+def read_baseline(path):
+    return json.loads(path.read_text())["tests"]
+
+
+def test_waits_are_timed_for_function_style_tests(run, pytester):
+    pytester.makepyfile(test_waits="""
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        def test_waits(pooled_driver):
+            wait = WebDriverWait(pooled_driver, 1)
+            wait.until(lambda driver: True)
+            wait.until_not(lambda driver: False)
+    """)
+    run().assert_outcomes(passed=1)
+    record, = json.loads((pytester.path / "results" / "perf.json").read_text())
+    assert record["waits"] == 2
+    assert record["wait_ms"] >= 0
+
+
+def test_update_appends_samples_and_keeps_history(run, pytester):
+    pytester.makepyfile(test_update="def test_fast():\n    pass\n")
+    nodeid = "test_update.py::test_fast"
+    baseline = write_baseline(pytester, {nodeid: {"duration_ms": [1000.0] * perf_plugin.BASELINE_HISTORY}})
+
+    result = run("--perf-baseline", str(baseline), "--perf-update-baseline")
+    assert result.ret == 0
+    samples = read_baseline(baseline)[nodeid]["duration_ms"]
+    assert len(samples) == perf_plugin.BASELINE_HISTORY
+    assert samples[:-1] == [1000.0] * (perf_plugin.BASELINE_HISTORY - 1)
+    assert samples[-1] < 1000.0
+
+
+def test_clear_regression_fails_the_run(run, pytester):
+    pytester.makepyfile(test_slow="import time\n\ndef test_slow():\n    time.sleep(0.25)\n")
+    baseline = write_baseline(pytester, {"test_slow.py::test_slow": {"duration_ms": [10.0, 11.0, 9.0, 10.5, 9.5]}})
+
+    result = run("--perf-baseline", str(baseline))
+    result.assert_outcomes(passed=1)
+    assert result.ret == pytest.ExitCode.TESTS_FAILED
+    result.stdout.fnmatch_lines(["*REGRESSION test_slow.py::test_slow duration_ms*"])
+
+
+def test_noise_within_history_passes(run, pytester):
+    pytester.makepyfile(test_noisy="def test_noisy():\n    pass\n")
+    baseline = write_baseline(pytester, {"test_noisy.py::test_noisy": {"duration_ms": [5.0, 60.0, 1.0, 40.0, 20.0]}})
+
+    result = run("--perf-baseline", str(baseline))
+    assert result.ret == 0
+    result.stdout.no_fnmatch_line("*REGRESSION*")
+
+
+def test_most_tests_slightly_slower_fail_by_sign_test(run, pytester):
+    # Каждый тест медленнее медианы меньше чем на min_delta, но все восемь - значимо
+    pytester.makepyfile(test_sign="""
+        import time
+        import pytest
+
+        @pytest.mark.parametrize("index", range(8))
+        def test_sleep(index):
+            time.sleep(0.01)
+    """)
+    baseline = write_baseline(pytester, {f"test_sign.py::test_sleep[{index}]": {"duration_ms": [0.1] * 5}
+                                         for index in range(8)})
+
+    result = run("--perf-baseline", str(baseline))
+    result.assert_outcomes(passed=8)
+    assert result.ret == pytest.ExitCode.TESTS_FAILED
+    result.stdout.fnmatch_lines(["*slower than baseline median: 8/8 tests*"])
+    result.stdout.no_fnmatch_line("*REGRESSION*")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
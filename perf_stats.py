@@ -0,0 +1,90 @@
+# Статистика для замеров производительности: перцентили и устойчивые к шуму сравнения
+import math
+import statistics
+
+# Масштаб MAD к стандартному отклонению для нормального распределения
+MAD_SCALE = 1.4826
+
+
+def percentile(samples, q):
+    # Линейная интерполяция между соседними рангами, как numpy.percentile по умолчанию
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    position = (len(ordered) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(samples, quantiles=(50, 95, 99)):
+    summary = {"count": len(samples)}
+    if samples:
+        summary["mean"] = statistics.fmean(samples)
+        summary["min"] = min(samples)
+        summary["max"] = max(samples)
+        for q in quantiles:
+            summary[f"p{q}"] = percentile(samples, q)
+    return summary
+
+
+def robust_z(value, samples):
+    median = statistics.median(samples)
+    mad = statistics.median(abs(sample - median) for sample in samples) * MAD_SCALE
+    if mad == 0:
+        return math.inf if value > median else 0.0
+    return (value - median) / mad
+
+
+def is_regression(value, samples, min_samples=5, z_threshold=3.5, min_ratio=1.2, min_delta=0.0):
+    # Одиночный замер считается регрессией только если он выбивается из истории
+    # и по устойчивому z-score, и по относительному, и по абсолютному приросту
+    if value is None or len(samples) < min_samples:
+        return False
+    median = statistics.median(samples)
+    return (robust_z(value, samples) > z_threshold
+            and value > median * min_ratio
+            and value - median > min_delta)
+
+
+def sign_test_p_value(slower, total):
+    # Односторонний биномиальный тест: вероятность получить >= slower замедлений
+    # из total при отсутствии реального сдвига (p = 0.5)
+    if total == 0:
+        return 1.0
+    return sum(math.comb(total, k) for k in range(slower, total + 1)) / 2 ** total
+
+
+def theil_sen_slope(values):
+    # Медиана наклонов по всем парам точек: одиночные выбросы (сборка мусора) тренд не сдвигают
+    slopes = [(values[j] - values[i]) / (j - i) for i in range(len(values)) for j in range(i + 1, len(values))]
+    return statistics.median(slopes) if slopes else 0.0
+
+
+def mann_kendall_p_value(values):
+    # Односторонний тест Манна-Кендалла на возрастающий тренд: сравниваются все пары точек,
+    # поэтому шум между соседними замерами не маскирует медленный рост
+    n = len(values)
+    if n < 3:
+        return 1.0
+    s = sum((values[j] > values[i]) - (values[j] < values[i]) for i in range(n) for j in range(i + 1, n))
+    variance = n * (n - 1) * (2 * n + 5) / 18
+    if s <= 0:
+        return 1.0
+    z = (s - 1) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def growth(values, min_relative=0.05, p_threshold=0.01):
+    # Устойчивый рост: тренд значим по Манну-Кендаллу, а прирост по наклону Тейла-Сена
+    # за всю серию заметен относительно начального значения
+    p_value = mann_kendall_p_value(values)
+    slope = theil_sen_slope(values)
+    trend_delta = slope * (len(values) - 1)
+    relative = trend_delta / values[0] if values and values[0] else (math.inf if trend_delta > 0 else 0.0)
+    return {
+        "slope": slope,
+        "p_value": p_value,
+        "relative": relative,
+        "growing": slope > 0 and p_value < p_threshold and relative >= min_relative,
+    }
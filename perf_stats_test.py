@@ -0,0 +1,78 @@
+# Статистика замеров на фиксированных сериях: явная регрессия, шум без регрессии, MAD == 0
+import math
+import unittest
+
+import pytest
+
+import perf_stats
+
+pytestmark = pytest.mark.smoke
+
+STABLE = [100, 102, 98, 101, 99, 100, 103, 97]
+NOISY = [100, 130, 85, 120, 95, 140, 80, 110, 125, 90]
+FLAT = [50, 50, 50, 50, 50, 50]
+
+
+class PerfStatsTests(unittest.TestCase):
+
+    def test_percentile_interpolates_like_numpy(self):
+        self.assertEqual(perf_stats.percentile([1, 2, 3, 4], 50), 2.5)
+        self.assertEqual(perf_stats.percentile([10, 20, 30, 40, 50], 95), 48.0)
+        self.assertIsNone(perf_stats.percentile([], 50))
+        self.assertEqual(perf_stats.summarize([]), {"count": 0})
+
+    def test_clear_regression(self):
+        self.assertAlmostEqual(perf_stats.robust_z(130, STABLE), 30 / (1.5 * perf_stats.MAD_SCALE))
+        self.assertTrue(perf_stats.is_regression(130, STABLE))
+        self.assertFalse(perf_stats.is_regression(130, STABLE, min_delta=50))
+        self.assertFalse(perf_stats.is_regression(130, STABLE[:4]))
+
+    def test_noisy_but_not_regressed(self):
+        # Выбивается по отношению к медиане (1.2x), но не по устойчивому z-score
+        self.assertLess(perf_stats.robust_z(135, NOISY), 3.5)
+        self.assertFalse(perf_stats.is_regression(135, NOISY))
+        # Быстрее истории - никогда не регрессия
+        self.assertFalse(perf_stats.is_regression(60, STABLE))
+        self.assertFalse(perf_stats.is_regression(None, STABLE))
+
+    def test_zero_mad(self):
+        self.assertEqual(perf_stats.robust_z(51, FLAT), math.inf)
+        self.assertEqual(perf_stats.robust_z(50, FLAT), 0.0)
+        self.assertEqual(perf_stats.robust_z(40, FLAT), 0.0)
+        # Без разброса решают относительный и абсолютный пороги
+        self.assertFalse(perf_stats.is_regression(51, FLAT))
+        self.assertTrue(perf_stats.is_regression(61, FLAT))
+        self.assertFalse(perf_stats.is_regression(61, FLAT, min_delta=20))
+
+    def test_sign_test(self):
+        self.assertEqual(perf_stats.sign_test_p_value(0, 0), 1.0)
+        self.assertEqual(perf_stats.sign_test_p_value(0, 10), 1.0)
+        self.assertEqual(perf_stats.sign_test_p_value(10, 10), 1 / 1024)
+        self.assertAlmostEqual(perf_stats.sign_test_p_value(8, 10), 56 / 1024)
+        self.assertAlmostEqual(perf_stats.sign_test_p_value(5, 10), 638 / 1024)
+
+    def test_mann_kendall(self):
+        self.assertLess(perf_stats.mann_kendall_p_value(list(range(20))), 1e-6)
+        self.assertEqual(perf_stats.mann_kendall_p_value(list(range(20, 0, -1))), 1.0)
+        self.assertEqual(perf_stats.mann_kendall_p_value(FLAT), 1.0)
+        self.assertEqual(perf_stats.mann_kendall_p_value([1, 2]), 1.0)
+        self.assertGreater(perf_stats.mann_kendall_p_value(NOISY), 0.1)
+
+    def test_growth(self):
+        # Медленный рост под шумом и одиночным выбросом
+        leaking = [100 + 2 * i + (3 if i % 2 else -3) for i in range(20)]
+        leaking[7] = 400
+        result = perf_stats.growth(leaking)
+        self.assertTrue(result["growing"])
+        self.assertAlmostEqual(result["slope"], 2.0, delta=0.5)
+
+        self.assertFalse(perf_stats.growth(NOISY)["growing"])
+        self.assertFalse(perf_stats.growth(FLAT)["growing"])
+        # Значимый, но мизерный относительно начального значения рост
+        tiny = [10000 + i for i in range(20)]
+        self.assertLess(perf_stats.mann_kendall_p_value(tiny), 0.01)
+        self.assertFalse(perf_stats.growth(tiny)["growing"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,217 @@
+# pytest-плагин: исходы тестов кешируются по хешам бандла, исходников теста и опций
+# запуска. Тест с теми же входами и той же версией браузера не запускается, его прошлый
+# исход (passed или известный баг xfail) переиспользуется; упавшие в прошлый раз идут первыми
+import glob
+import hashlib
+import os
+
+import pytest
+
+from static_server import ASSETS_DIR, ROOT, STATIC_FILES
+
+CACHE_KEY = "result-cache/outcomes"
+KEY_PROPERTY = "result-cache-key"
+REUSED_PROPERTY = "result-cache-reused"
+BROWSER_PROPERTY = "result-cache-browser"
+REUSABLE_OUTCOMES = ("passed", "xfailed")
+# Опции conftest, меняющие то, что делает тест: page objects, источник ассетов, запись
+# или сравнение снимков и каталог эталонов
+RUN_OPTIONS = ("backend", "asset_cache", "visual_update", "visual_baseline")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("result-cache", "reuse outcomes of unchanged tests")
+    group.addoption("--result-cache", action="store_true", default=bool(os.environ.get("BANK_RESULT_CACHE")),
+                    help="skip tests whose bundle, sources and browser are unchanged and reuse their outcomes")
+
+
+def pytest_configure(config):
+    if config.getoption("result_cache"):
+        config.pluginmanager.register(ResultCache(config), "result-cache")
+
+
+def _sha256_files(paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.relpath(path, ROOT).encode())
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def bundle_digest(root=ROOT):
+    paths = [os.path.join(root, name) for name in STATIC_FILES]
+    paths += sorted(glob.glob(os.path.join(root, ASSETS_DIR, "*")))
+    return _sha256_files(paths)
+
+
+def support_digest(root=ROOT):
+    # Page objects, ожидания, модель, плагины и зависимости: их правка меняет исходы всех тестов.
+    # Markdown и эталоны сюда не входят - они учитываются через TEST_DATA только у читающих их модулей
+    paths = sorted(path for path in glob.glob(os.path.join(root, "*.py")) if not path.endswith("_test.py"))
+    return _sha256_files(paths + [os.path.join(root, "requirements.txt")])
+
+
+def _case_files(config):
+    import case_engine  # тянет Selenium, нужен только при --result-cache
+    return [os.path.join(ROOT, name) for name in case_engine.CASE_FILES]
+
+
+def _visual_entries(config):
+    # Записи индекса ссылаются на тайлы по хешу содержимого, поэтому хватает хеша записей
+    return sorted(glob.glob(os.path.join(config.getoption("visual_baseline"), "entries", "*.json")))
+
+
+# Данные, которые тесты модуля читают во время прогона, а не при сборе: правка
+# FIRST/SECOND/THIRD.md или эталонов сбрасывает исходы всех тестов модуля
+TEST_DATA = {
+    "cases_test.py": _case_files,
+    "visual_test.py": _visual_entries,
+}
+
+
+def data_digest(config, module):
+    paths = TEST_DATA[module](config) if module in TEST_DATA else []
+    return _sha256_files([path for path in paths if os.path.isfile(path)])
+
+
+def run_options(config):
+    options = [(name, config.getoption(name, None)) for name in RUN_OPTIONS]
+    return repr(options + [("base_url", os.environ.get("BANK_BASE_URL", ""))])
+
+
+class ResultCache:
+
+    def __init__(self, config):
+        self.config = config
+        self.outcomes = config.cache.get(CACHE_KEY, {})
+        self.updates = {}
+        self.reused = 0
+        self.ran = set()
+        # Версия браузера, который реально запускает chromedriver: из BANK_BROWSER_VERSION
+        # или из capabilities первого драйвера, отработавшего в этом процессе
+        self.browser = os.environ.get("BANK_BROWSER_VERSION")
+        self._inputs = None
+        self._data = {}
+
+    def _key(self, item):
+        if self._inputs is None:
+            self._inputs = (bundle_digest(), support_digest(), run_options(self.config))
+        bundle, support, options = self._inputs
+        digest = hashlib.sha256()
+        digest.update(item.nodeid.encode())
+        digest.update(bundle.encode())
+        digest.update(support.encode())
+        digest.update(options.encode())
+        digest.update(_sha256_files([str(item.path)]).encode())
+        module = os.path.basename(str(item.path))
+        if module not in self._data:
+            self._data[module] = data_digest(self.config, module)
+        digest.update(self._data[module].encode())
+        if hasattr(item, "callspec"):
+            digest.update(repr(sorted(item.callspec.params.items())).encode())
+        return digest.hexdigest()
+
+    def _reusable(self, item, cached, key):
+        if cached is None or cached["key"] != key or cached["outcome"] not in REUSABLE_OUTCOMES:
+            return False
+        # Версия браузера важна только тестам, которые его запускают. Пока версия в этом
+        # процессе не известна, такие тесты запускаются - первый же из них её сообщит
+        if "pooled_driver" in item.fixturenames:
+            return self.browser is not None and cached.get("browser") == self.browser
+        return True
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, items):
+        for item in items:
+            item.user_properties.append((KEY_PROPERTY, self._key(item)))
+        # После группировки сценариев: упавшие в прошлый раз поднимаем наверх, остальной порядок не трогаем
+        failed = [item for item in items if self.outcomes.get(item.nodeid, {}).get("outcome") == "failed"]
+        if failed:
+            failed_ids = {item.nodeid for item in failed}
+            items[:] = failed + [item for item in items if item.nodeid not in failed_ids]
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        key = dict(item.user_properties).get(KEY_PROPERTY)
+        cached = self.outcomes.get(item.nodeid)
+        if not self._reusable(item, cached, key):
+            return None
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        for when in ("setup", "call", "teardown"):
+            item.ihook.pytest_runtest_logreport(report=_cached_report(item, when, cached))
+        # Фикстуры предыдущего теста, оставленные ради этого, снимаются так же, как это
+        # делает teardown-фаза pytest (сам хук звать нельзя: плагины ждут setup этого теста).
+        # _setupstate - приватный API pytest, проверен на 7.4; версия закреплена в requirements.txt
+        item.session._setupstate.teardown_exact(nextitem)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        return True
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        driver = item.funcargs.get("pooled_driver") if hasattr(item, "funcargs") else None
+        if driver is None:
+            return
+        version = driver.capabilities.get("browserVersion")
+        if version and not os.environ.get("BANK_BROWSER_VERSION"):
+            self.browser = version
+        outcome.get_result().user_properties.append((BROWSER_PROPERTY, version))
+
+    def pytest_runtest_logreport(self, report):
+        properties = dict(report.user_properties)
+        if properties.get(REUSED_PROPERTY):
+            if report.when == "call":
+                self.reused += 1
+            return
+        key = properties.get(KEY_PROPERTY)
+        if key is None:
+            return
+        self.ran.add(report.nodeid)
+        outcome = _outcome(report)
+        if outcome is None:
+            return
+        self.updates[report.nodeid] = {"key": key, "outcome": outcome, "reason": getattr(report, "wasxfail", ""),
+                                       "browser": properties.get(BROWSER_PROPERTY)}
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(self.config, "workerinput") or not self.updates:
+            return
+        outcomes = self.config.cache.get(CACHE_KEY, {})
+        outcomes.update(self.updates)
+        self.config.cache.set(CACHE_KEY, outcomes)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if hasattr(self.config, "workerinput"):
+            return
+        terminalreporter.write_sep("-", "result cache")
+        terminalreporter.write_line(f"{self.reused} outcomes reused, {len(self.ran)} tests run")
+
+
+def _outcome(report):
+    # Исход по фазе: падение в любой фазе - failed, иначе решает call
+    if report.failed:
+        return "failed"
+    if report.when != "call":
+        return None
+    if hasattr(report, "wasxfail"):
+        return "xfailed" if report.skipped else "xpassed"
+    return report.outcome
+
+
+def _cached_report(item, when, cached):
+    outcome = "passed"
+    if when == "call" and cached["outcome"] == "xfailed":
+        outcome = "skipped"
+    report = pytest.TestReport(
+        nodeid=item.nodeid,
+        location=item.location,
+        keywords={name: 1 for name in item.keywords},
+        outcome=outcome,
+        longrepr=None,
+        when=when,
+        user_properties=list(item.user_properties) + [(REUSED_PROPERTY, True)],
+    )
+    if outcome == "skipped":
+        report.wasxfail = cached["reason"] or "cached"
+    return report
@@ -0,0 +1,72 @@
+# Плагин result_cache на отдельных прогонах pytester: переиспользование исходов,
+# восстановленный xfail, упавшие первыми и сброс по ключу
+import pytest
+
+import result_cache
+
+pytest_plugins = ["pytester"]
+pytestmark = pytest.mark.smoke
+
+TESTS = """
+import os
+import pytest
+
+def test_passes():
+    pass
+
+@pytest.mark.xfail(reason="Известный баг: BUG-002")
+def test_known_bug():
+    assert False
+
+def test_flag():
+    assert not os.path.exists("fail.flag")
+"""
+
+
+@pytest.fixture
+def run(pytester, monkeypatch):
+    monkeypatch.delenv("BANK_RESULT_CACHE", raising=False)
+    monkeypatch.delenv("BANK_BASE_URL", raising=False)
+    pytester.makepyfile(test_cached=TESTS)
+
+    def run(*args):
+        return pytester.runpytest_inprocess("-p", "result_cache", "--result-cache", "-p", "no:xdist", "-rx", *args)
+    return run
+
+
+def test_unchanged_tests_reuse_outcomes(run):
+    run().assert_outcomes(passed=2, xfailed=1)
+
+    result = run()
+    result.assert_outcomes(passed=2, xfailed=1)
+    result.stdout.fnmatch_lines(["*3 outcomes reused, 0 tests run*", "*XFAIL test_cached.py::test_known_bug*BUG-002*"])
+
+
+def test_failed_tests_run_first_and_are_not_reused(run, pytester):
+    pytester.path.joinpath("fail.flag").write_text("")
+    run().assert_outcomes(passed=1, failed=1, xfailed=1)
+
+    result = run("-v")
+    result.assert_outcomes(passed=1, failed=1, xfailed=1)
+    result.stdout.fnmatch_lines(["*test_flag FAILED*", "*test_passes PASSED*", "*2 outcomes reused, 1 tests run*"])
+
+
+def test_source_run_options_and_data_change_the_key(run, pytester, monkeypatch):
+    data = pytester.path.joinpath("cases.md")
+    data.write_text("### Bug-001: x\n")
+    monkeypatch.setitem(result_cache.TEST_DATA, "test_cached.py", lambda config: [str(data)])
+    run()
+    run().stdout.fnmatch_lines(["*3 outcomes reused, 0 tests run*"])
+
+    data.write_text("### Bug-001: x\n### Bug-007: y\n")
+    run().stdout.fnmatch_lines(["*0 outcomes reused, 3 tests run*"])
+
+    monkeypatch.setenv("BANK_BASE_URL", "http://127.0.0.1:1")
+    run().stdout.fnmatch_lines(["*0 outcomes reused, 3 tests run*"])
+
+    pytester.makepyfile(test_cached=TESTS + "\n\ndef test_added():\n    pass\n")
+    run().stdout.fnmatch_lines(["*0 outcomes reused, 4 tests run*"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
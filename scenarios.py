@@ -0,0 +1,165 @@
+# Общие предусловия тестов: открыть страницу, выбрать рублёвый счёт, ввести номер карты.
+# Префикс выполняется один раз на браузер, следующим тестам с тем же префиксом
+# состояние формы возвращается из снимка без перезагрузки страницы
+import uuid
+import weakref
+from collections import namedtuple
+
+from browser import WINDOW_SIZE
+from pages import DashboardPage
+from waits import alert_present, dismiss_alert
+
+Scenario = namedtuple("Scenario", "balance reserved select card")
+
+_MARK_DOCUMENT_JS = "window.__scenarioToken = arguments[0];"
+
+# Кроме полей ввода - комиссия и кнопка: бандл хранит сумму в состоянии и после
+# размонтирования поля, а заново смонтированное поле показывает 1000 по умолчанию.
+# Одинаковые поля при разной комиссии значат, что форма считает другую сумму
+_FORM_STATE_JS = """
+const formState = () => {
+  const root = document.getElementById('root');
+  const commission = document.getElementById('comission');
+  return {
+    inputs: Array.from(root.querySelectorAll('input')).map(el => [el.placeholder, el.value]),
+    commission: commission ? commission.textContent : null,
+    button: Array.from(root.querySelectorAll('button')).some(el => el.textContent.includes('Перевести')),
+  };
+};
+"""
+
+_SNAPSHOT_JS = _FORM_STATE_JS + "return formState();"
+
+# Значения ставятся через нативный setter + input, как при вводе: React обновляет
+# своё состояние, а поле суммы появляется после восстановления номера карты.
+# Чужой документ (была навигация) распознаётся по метке и даёт null
+_RESTORE_JS = _FORM_STATE_JS + """
+const [token, snapshot] = arguments;
+const done = arguments[arguments.length - 1];
+if (window.__scenarioToken !== token) { done(null); return; }
+const root = document.getElementById('root');
+const setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+let index = 0;
+const next = () => {
+  if (index === snapshot.inputs.length) {
+    done(formState());
+    return;
+  }
+  const [placeholder, value] = snapshot.inputs[index++];
+  const input = root.querySelector(`input[placeholder="${placeholder}"]`);
+  if (input && input.value !== value) {
+    setter.call(input, value);
+    input.dispatchEvent(new Event('input', {bubbles: true}));
+  }
+  setTimeout(next, 0);
+};
+next();
+"""
+
+
+def scenario_from_marker(marker):
+    # @pytest.mark.scenario(balance=30000, reserved=20001, select=True, card="1234...")
+    options = dict(marker.kwargs)
+    return Scenario(
+        balance=options.pop("balance", 30000),
+        reserved=options.pop("reserved", 20001),
+        select=options.pop("select", False),
+        card=options.pop("card", None),
+        **options,
+    )
+
+
+def scenario_steps(scenario):
+    steps = [("open", (scenario.balance, scenario.reserved))]
+    if scenario.select or scenario.card is not None:
+        steps.append(("select", None))
+    if scenario.card is not None:
+        steps.append(("card", scenario.card))
+    return tuple(steps)
+
+
+def group_name(scenario):
+    return f"scenario-{scenario.balance}-{scenario.reserved}"
+
+
+def schedule(items):
+    # Тесты без сценария идут первыми в исходном порядке. Дальше сценарии сгруппированы
+    # по URL, внутри группы от короткого префикса к длинному, чтобы каждый следующий
+    # только дописывал шаги. Тесты, меняющие страницу, в самом конце
+    plain = []
+    shared = []
+    for item in items:
+        (plain if item.get_closest_marker("scenario") is None else shared).append(item)
+    return plain + sorted(shared, key=_schedule_key)
+
+
+def _schedule_key(item):
+    steps = scenario_steps(scenario_from_marker(item.get_closest_marker("scenario")))
+    isolated = item.get_closest_marker("mutates_page") is not None
+    return isolated, [(kind, str(value)) for kind, value in steps]
+
+
+class ScenarioRunner:
+    # Один на браузер. Помнит выполненные шаги и снимок полей формы после них
+
+    def __init__(self, driver, base_url, page_class=DashboardPage):
+        self.driver = driver
+        self.page = page_class(driver, None, base_url)
+        self.invalidate()
+
+    def invalidate(self):
+        self.steps = ()
+        self.snapshot = None
+        self.token = None
+        self.url = None
+
+    def prepare(self, scenario, wait):
+        self.page.wait = wait
+        steps = scenario_steps(scenario)
+        done = 0
+        if self.steps and steps[:len(self.steps)] == self.steps and self._restore():
+            done = len(self.steps)
+        for step in steps[done:]:
+            self._run(step)
+        if done < len(steps):
+            self.snapshot = self.driver.execute_script(_SNAPSHOT_JS)
+        self.steps = steps
+        return self.page
+
+    def finish(self, isolated=False):
+        # Alert, размер окна и уход с URL сценария делают снимок бесполезным
+        mutated = isolated
+        if alert_present()(self.driver):
+            dismiss_alert(self.driver)
+            mutated = True
+        size = self.driver.get_window_size()
+        if (size["width"], size["height"]) != WINDOW_SIZE or self.driver.current_url != self.url:
+            mutated = True
+        if mutated:
+            self.invalidate()
+
+    def _restore(self):
+        if self.driver.current_url != self.url:
+            return False
+        return self.driver.execute_async_script(_RESTORE_JS, self.token, self.snapshot) == self.snapshot
+
+    def _run(self, step):
+        kind, value = step
+        if kind == "open":
+            self.page.open(*value)
+            self.token = uuid.uuid4().hex
+            self.driver.execute_script(_MARK_DOCUMENT_JS, self.token)
+            self.url = self.driver.current_url
+        elif kind == "select":
+            self.page.rubles_card.select()
+        elif kind == "card":
+            self.page.transfer_form.enter_card(value)
+
+
+_runners = weakref.WeakKeyDictionary()
+
+
+def runner_for(driver, base_url, page_class=DashboardPage):
+    if driver not in _runners:
+        _runners[driver] = ScenarioRunner(driver, base_url, page_class)
+    return _runners[driver]
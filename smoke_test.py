@@ -0,0 +1,85 @@
+# Smoke-уровень: статическая проверка сборки и модели расчётов без браузера.
+# Идёт первым; падение останавливает прогон до запуска Chrome
+import hashlib
+import math
+import os
+import unittest
+
+import pytest
+
+import bundle_model
+import transfer_model
+from static_server import ROOT
+
+pytestmark = pytest.mark.smoke
+
+# Хеши собранных файлов, против которых написаны кейсы FIRST/SECOND/THIRD.md.
+# Новая сборка должна обновлять их осознанно, вместе с перепроверкой известных багов
+BUILD_SHA256 = {
+    "index.html": "10562979440e46a0cdc2456fab431e70d00736b757e59388b9c117dddead5e75",
+    "vite.svg": "4a748afd443918bb16591c834c401dae33e87861ab5dbad0811c3a3b4a9214fb",
+    "assets/index-BUH56GOL.js": "e7835a7b62670e08a971fc6e294eba1a59b88b10419b7ed28d47d5c47ae3b29d",
+    "assets/index-Dy9zO9yl.css": "cc8e34e2c04ed6c14c422cc9bbcbca8e4b551cfe7ee2d022e287a4f406343ee1",
+}
+QUERY_VALUES = ("", "0", "30000", "20001", "-100", "1e3", "0x10", "12.5", " 7 ", "abc", "xyz", "Infinity")
+
+
+class BuildSmokeTests(unittest.TestCase):
+
+    def test_index_references_existing_assets(self):
+        index = bundle_model.parse_index()
+        self.assertEqual(index.title.strip(), "F-Bank")
+        self.assertIn("root", index.ids)
+        references = [attrs["src"] for attrs in index.scripts] + [attrs["href"] for attrs in index.stylesheets]
+        self.assertTrue(references)
+        for reference in references:
+            self.assertTrue(os.path.isfile(os.path.join(ROOT, reference.lstrip("/"))), reference)
+
+    def test_build_hashes(self):
+        for name, expected in BUILD_SHA256.items():
+            with open(os.path.join(ROOT, name), "rb") as f:
+                self.assertEqual(hashlib.sha256(f.read()).hexdigest(), expected, name)
+
+
+class BundleModelSmokeTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.model = bundle_model.load()
+
+    def test_commission_constants_match_transfer_model(self):
+        self.assertEqual(self.model.commission_step, transfer_model.COMMISSION_STEP)
+        self.assertEqual(self.model.commission_per_step, transfer_model.COMMISSION_PER_STEP)
+        for amount in (0, 1, 55, 99, 100, 199, 5000, 9091, 9999, -100, -1):
+            self.assertEqual(bundle_model.commission(self.model, amount), transfer_model.app_commission(amount))
+
+    def test_can_transfer_matches_transfer_model(self):
+        # Строгое сравнение: остаток ровно 0 приложение не пропускает (TC-009)
+        self.assertTrue(self.model.strict)
+        for balance, reserved, amount in ((30000, 20001, 5000), (30000, 20001, 9500),
+                                          (10010, 0, 9100), (10000, 0, 9091), (0, 0, 0)):
+            self.assertEqual(bundle_model.can_transfer(self.model, balance, reserved, amount),
+                             transfer_model.app_can_transfer(balance, reserved, amount))
+
+    def test_query_parsing_matches_transfer_model(self):
+        self.assertEqual(self.model.query_defaults, {"balance": "0", "reserved": "0"})
+        for raw in QUERY_VALUES + (None,):
+            for name in ("balance", "reserved"):
+                expected = transfer_model.app_query_number(raw)
+                actual = bundle_model.query_number(self.model, name, raw)
+                if isinstance(expected, float) and math.isnan(expected):
+                    self.assertTrue(math.isnan(actual), raw)
+                else:
+                    self.assertEqual(actual, expected, raw)
+
+    def test_bug_003_still_reproduces_in_bundle(self):
+        # test_09 ждёт NaN вместо 0 на ?balance=abc: если бандл начал фильтровать
+        # параметры, xfail в браузере станет XPASS - узнаём об этом до запуска Chrome
+        value = bundle_model.query_number(self.model, "balance", "abc")
+        self.assertTrue(math.isnan(value))
+        self.assertEqual(transfer_model.spec_query_number("abc"), 0)
+        self.assertEqual(transfer_model.format_balance(value), "NaN")
+
+    def test_group_separator_matches_format_balance(self):
+        self.assertEqual(self.model.group_separator, "'")
+        self.assertEqual(transfer_model.format_balance(30000), "30" + self.model.group_separator + "000")
@@ -0,0 +1,243 @@
+# Многопоточный статический сервер для собранного SPA: файлы читаются один раз,
+# сжимаются заранее и отдаются из памяти
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import perf_stats
+
+try:
+    import brotli
+except ImportError:  # brotli необязателен, без него отдаём gzip
+    brotli = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+HEALTH_PATH = "/healthz"
+STATIC_FILES = ("index.html", "vite.svg")
+ASSETS_DIR = "assets"
+
+# Имена в assets/ содержат хеш содержимого, их можно кешировать навсегда
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+ETAG_SUFFIXES = {"identity": "", "gzip": "-gz", "br": "-br"}
+
+
+class StaticAsset:
+
+    def __init__(self, path, body, content_type, cache_control):
+        self.path = path
+        self.body = body
+        self.content_type = content_type
+        self.cache_control = cache_control
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etag = '"%s"' % digest
+        self.encoded = {"identity": body, "gzip": gzip.compress(body, compresslevel=9)}
+        if brotli is not None:
+            self.encoded["br"] = brotli.compress(body)
+        # Сжатые тела - другие представления (Vary: Accept-Encoding), у каждого свой сильный ETag
+        self.etags = {encoding: '"%s%s"' % (digest, ETAG_SUFFIXES[encoding]) for encoding in self.encoded}
+
+    def negotiate(self, accept_encoding):
+        accepted = {part.split(";")[0].strip() for part in (accept_encoding or "").split(",")}
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in self.encoded:
+                # Мелкие файлы после сжатия бывают больше оригинала
+                if len(self.encoded[encoding]) < len(self.body):
+                    return encoding, self.encoded[encoding]
+        return "identity", self.body
+
+
+def etag_matches(if_none_match, etag):
+    # If-None-Match - список через запятую или "*"; сравнение слабое, префикс W/ не учитывается
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return any(candidate == "*" or candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def _content_type(name):
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type in ("application/javascript", "image/svg+xml"):
+        content_type += "; charset=utf-8"
+    return content_type
+
+
+def load_assets(root=ROOT):
+    assets = {}
+    for name in STATIC_FILES:
+        with open(os.path.join(root, name), "rb") as f:
+            assets["/" + name] = StaticAsset("/" + name, f.read(), _content_type(name), REVALIDATE_CACHE)
+    assets_dir = os.path.join(root, ASSETS_DIR)
+    for name in sorted(os.listdir(assets_dir)):
+        url_path = f"/{ASSETS_DIR}/{name}"
+        with open(os.path.join(assets_dir, name), "rb") as f:
+            assets[url_path] = StaticAsset(url_path, f.read(), _content_type(name), IMMUTABLE_CACHE)
+    assets["/"] = assets["/index.html"]
+    return assets
+
+
+def resolve_asset(assets, path):
+    # SPA fallback: /?balance=... и любые пути без расширения отдают index.html
+    asset = assets.get(path)
+    if asset is None and not os.path.splitext(path)[1]:
+        asset = assets["/index.html"]
+    return asset
+
+
+class ServerMetrics:
+    # Счётчики со всех потоков сервера: запросы, байты, статусы, пик одновременных запросов
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.bytes_sent = 0
+            self.by_status = {}
+            self.by_path = {}
+            self.in_flight = 0
+            self.peak_in_flight = 0
+            self.latencies_ms = []
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finished(self, path, status, size, elapsed_ms):
+        with self._lock:
+            self.in_flight -= 1
+            self.requests += 1
+            self.bytes_sent += size
+            self.by_status[status] = self.by_status.get(status, 0) + 1
+            self.by_path[path] = self.by_path.get(path, 0) + 1
+            self.latencies_ms.append(elapsed_ms)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "bytes_sent": self.bytes_sent,
+                "by_status": dict(self.by_status),
+                "by_path": dict(self.by_path),
+                "peak_in_flight": self.peak_in_flight,
+                "latency_ms": perf_stats.summarize(self.latencies_ms),
+            }
+
+
+class StaticHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    assets = {}
+    metrics = None
+
+    def do_GET(self):
+        self._measured(send_body=True)
+
+    def do_HEAD(self):
+        self._measured(send_body=False)
+
+    def _measured(self, send_body):
+        if self.metrics is None:
+            self._serve(send_body)
+            return
+        start = time.perf_counter()
+        self._status, self._sent = None, 0
+        self.metrics.started()
+        try:
+            self._serve(send_body)
+        finally:
+            self.metrics.finished(urlsplit(self.path).path, self._status, self._sent,
+                                  (time.perf_counter() - start) * 1000)
+
+    def _serve(self, send_body):
+        path = urlsplit(self.path).path
+        if path == HEALTH_PATH:
+            self._send(200, b"ok", {"Content-Type": "text/plain", "Cache-Control": "no-store"}, send_body)
+            return
+        asset = resolve_asset(self.assets, path)
+        if asset is None:
+            self._send(404, b"not found", {"Content-Type": "text/plain"}, send_body)
+            return
+
+        encoding, body = asset.negotiate(self.headers.get("Accept-Encoding"))
+        headers = {
+            "Content-Type": asset.content_type,
+            "Cache-Control": asset.cache_control,
+            "ETag": asset.etags[encoding],
+            "Vary": "Accept-Encoding",
+        }
+        if etag_matches(self.headers.get("If-None-Match"), asset.etags[encoding]):
+            self._send(304, b"", headers, send_body=False)
+            return
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        self._send(200, body, headers, send_body)
+
+    def _send(self, status, body, headers, send_body):
+        self._status, self._sent = status, len(body) if send_body else 0
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body and body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StaticServer:
+
+    def __init__(self, host="127.0.0.1", port=0, root=ROOT):
+        self.metrics = ServerMetrics()
+        handler = type("BoundStaticHandler", (StaticHandler,), {"assets": load_assets(root), "metrics": self.metrics})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, timeout=5.0):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        wait_until_healthy(self.base_url, timeout)
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def wait_until_healthy(base_url, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(base_url + HEALTH_PATH, timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            if time.monotonic() >= deadline:
+                raise
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"{base_url}{HEALTH_PATH} is not healthy after {timeout}s")
+        time.sleep(0.01)
+
+
+if __name__ == "__main__":
+    server = StaticServer(port=8000)
+    print(f"Serving {ROOT} at {server.base_url}")
+    server.httpd.serve_forever()
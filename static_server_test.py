@@ -0,0 +1,119 @@
+# Статический сервер без браузера: ETag/304, выбор сжатия, SPA fallback, 404 и /healthz
+import gzip
+import http.client
+import unittest
+from urllib.parse import urlsplit
+
+import pytest
+
+import static_server
+
+pytestmark = pytest.mark.smoke
+
+JS_ASSET = "/assets/index-BUH56GOL.js"
+
+
+class StaticServerTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = static_server.StaticServer().start()
+        cls.assets = static_server.load_assets()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def request(self, path, method="GET", **headers):
+        address = urlsplit(self.server.base_url)
+        connection = http.client.HTTPConnection(address.hostname, address.port, timeout=5)
+        try:
+            connection.request(method, path, headers=headers)
+            response = connection.getresponse()
+            return response.status, {name.lower(): value for name, value in response.getheaders()}, response.read()
+        finally:
+            connection.close()
+
+    def test_healthz(self):
+        status, headers, body = self.request(static_server.HEALTH_PATH)
+        self.assertEqual((status, body), (200, b"ok"))
+        self.assertEqual(headers["cache-control"], "no-store")
+
+    def test_etag_revalidation_returns_304(self):
+        status, headers, body = self.request(JS_ASSET)
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["cache-control"], static_server.IMMUTABLE_CACHE)
+        etag = headers["etag"]
+
+        status, headers, body = self.request(JS_ASSET, **{"If-None-Match": etag})
+        self.assertEqual((status, body), (304, b""))
+        self.assertEqual(headers["etag"], etag)
+
+        status, headers, body = self.request(JS_ASSET, **{"If-None-Match": '"stale"'})
+        self.assertEqual(status, 200)
+        self.assertEqual(body, self.assets[JS_ASSET].body)
+
+    def test_if_none_match_list_weak_and_star(self):
+        etag = self.assets[JS_ASSET].etag
+        for header in (f'"other", {etag}', f"W/{etag}", "*"):
+            status, headers, body = self.request(JS_ASSET, **{"If-None-Match": header})
+            self.assertEqual(status, 304, header)
+        self.assertFalse(static_server.etag_matches(None, etag))
+        self.assertFalse(static_server.etag_matches('"other", W/"stale"', etag))
+
+    def test_each_encoding_has_its_own_etag(self):
+        asset = self.assets[JS_ASSET]
+        status, headers, body = self.request(JS_ASSET, **{"Accept-Encoding": "gzip"})
+        gzip_etag = headers["etag"]
+        self.assertEqual(gzip_etag, asset.etags["gzip"])
+        self.assertNotEqual(gzip_etag, asset.etag)
+        self.assertEqual(len(set(asset.etags.values())), len(asset.encoded))
+
+        # Сохранённое несжатое тело не подтверждается для gzip-представления и наоборот
+        status, headers, body = self.request(JS_ASSET, **{"Accept-Encoding": "gzip", "If-None-Match": asset.etag})
+        self.assertEqual(status, 200)
+        status, headers, body = self.request(JS_ASSET, **{"Accept-Encoding": "gzip", "If-None-Match": gzip_etag})
+        self.assertEqual(status, 304)
+        status, headers, body = self.request(JS_ASSET, **{"Accept-Encoding": "identity", "If-None-Match": gzip_etag})
+        self.assertEqual(status, 200)
+
+    def test_gzip_when_brotli_is_not_accepted(self):
+        status, headers, body = self.request(JS_ASSET, **{"Accept-Encoding": "gzip, deflate"})
+        self.assertEqual(headers["content-encoding"], "gzip")
+        self.assertEqual(headers["vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(body), self.assets[JS_ASSET].body)
+
+    def test_brotli_is_preferred(self):
+        brotli = pytest.importorskip("brotli")
+        status, headers, body = self.request(JS_ASSET, **{"Accept-Encoding": "gzip, br"})
+        self.assertEqual(headers["content-encoding"], "br")
+        self.assertEqual(brotli.decompress(body), self.assets[JS_ASSET].body)
+
+    def test_identity_without_accept_encoding_and_for_small_files(self):
+        status, headers, body = self.request(JS_ASSET, **{"Accept-Encoding": "identity"})
+        self.assertNotIn("content-encoding", headers)
+        self.assertEqual(body, self.assets[JS_ASSET].body)
+        # Сжатый маленький файл вышел бы больше оригинала
+        tiny = static_server.StaticAsset("/tiny.txt", b"ok", "text/plain", static_server.REVALIDATE_CACHE)
+        self.assertEqual(tiny.negotiate("br, gzip"), ("identity", b"ok"))
+
+    def test_spa_fallback_serves_index(self):
+        index = self.assets["/index.html"].body
+        for path in ("/", "/?balance=30000&reserved=20001", "/transfer/rub"):
+            status, headers, body = self.request(path, **{"Accept-Encoding": "identity"})
+            self.assertEqual((status, body), (200, index), path)
+            self.assertEqual(headers["cache-control"], static_server.REVALIDATE_CACHE)
+
+    def test_missing_file_with_extension_is_404(self):
+        for path in ("/assets/missing.js", "/favicon.ico"):
+            status, headers, body = self.request(path)
+            self.assertEqual(status, 404, path)
+
+    def test_head_sends_headers_without_body(self):
+        status, headers, body = self.request(JS_ASSET, method="HEAD", **{"Accept-Encoding": "identity"})
+        self.assertEqual((status, body), (200, b""))
+        self.assertEqual(int(headers["content-length"]), len(self.assets[JS_ASSET].body))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
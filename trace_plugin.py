@@ -0,0 +1,323 @@
+# pytest-плагин: спан на каждую команду WebDriver и каждое ожидание WebDriverWait
+# (имя, локатор, длительность, число опросов, тест). Пишет Chrome trace для
+# chrome://tracing / Perfetto и сводку "самые медленные локаторы / самые долгие ожидания"
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+import pytest
+
+import perf_stats
+
+TRACE_PROPERTY = "trace"
+REPORT_TOP = 15
+SUMMARY_TOP = 5
+SCRIPT_LABEL_LENGTH = 60
+# Сколько последних найденных элементов помнить: page.cache сценариев держит элементы
+# между тестами, поэтому локаторы переживают тест, но словарь не растёт весь прогон
+ELEMENT_LOCATORS = 5000
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("webdriver-trace", "per-command WebDriver tracing")
+    group.addoption("--webdriver-trace", action="store_true", default=bool(os.environ.get("BANK_TRACE")),
+                    help="trace every WebDriver command and wait into test-results/trace.json")
+
+
+def pytest_configure(config):
+    if config.getoption("webdriver_trace"):
+        config.pluginmanager.register(TracePlugin(config), "webdriver-trace")
+
+
+def _now_us():
+    return time.perf_counter_ns() // 1000
+
+
+def _format_locator(by, value):
+    return f"{by}={value}"
+
+
+def _locator_strategies():
+    from selenium.webdriver.common.by import By
+    return {value for name, value in vars(By).items() if not name.startswith("_")}
+
+
+def _condition_locator(method):
+    # Условия из expected_conditions и waits.py - замыкания, локатор лежит в их ячейках
+    strategies = _locator_strategies()
+    for cell in getattr(method, "__closure__", None) or ():
+        try:
+            value = cell.cell_contents
+        except ValueError:
+            continue
+        if isinstance(value, tuple) and len(value) == 2 and isinstance(value[0], str) and value[0] in strategies:
+            return _format_locator(*value)
+    return None
+
+
+def condition_name(method):
+    name = getattr(method, "__qualname__", None) or type(method).__name__
+    return name.split(".<locals>")[0]
+
+
+class Tracer:
+    # Подменяет execute у класса WebDriver и until/until_not у WebDriverWait: так в трейс
+    # попадают все драйверы и все ожидания, включая созданные page objects и фикстурами.
+    # Подмены perf_plugin вызывают эти методы и не мешают им. Selenium импортируется
+    # в install(): модуль плагина грузится на каждом прогоне, в том числе smoke
+
+    def __init__(self):
+        self.spans = []
+        self.test = None
+        self.worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        self._elements = OrderedDict()
+        self._lock = threading.Lock()
+        self._originals = {}
+
+    def install(self):
+        from selenium.webdriver.remote.webdriver import WebDriver
+        from selenium.webdriver.support.ui import WebDriverWait
+        self._originals = {
+            (WebDriver, "execute"): WebDriver.execute,
+            (WebDriverWait, "until"): WebDriverWait.until,
+            (WebDriverWait, "until_not"): WebDriverWait.until_not,
+        }
+        WebDriver.execute = self._traced_execute(WebDriver.execute)
+        WebDriverWait.until = self._traced_wait(WebDriverWait.until, "until")
+        WebDriverWait.until_not = self._traced_wait(WebDriverWait.until_not, "until_not")
+
+    def uninstall(self):
+        for (owner, name), original in self._originals.items():
+            setattr(owner, name, original)
+        self._originals = {}
+
+    def drain(self):
+        with self._lock:
+            spans, self.spans = self.spans, []
+        return spans
+
+    def span(self, name, category, start, **args):
+        record = {
+            "name": name,
+            "cat": category,
+            "ts": start,
+            "dur": _now_us() - start,
+            "test": self.test,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "worker": self.worker,
+            "args": {key: value for key, value in args.items() if value is not None},
+        }
+        with self._lock:
+            self.spans.append(record)
+
+    def _traced_execute(self, original):
+        tracer = self
+
+        def execute(driver, driver_command, params=None):
+            start = _now_us()
+            error = None
+            try:
+                response = original(driver, driver_command, params)
+            except Exception as e:
+                error = type(e).__name__
+                raise
+            else:
+                tracer._remember_elements(driver_command, params, response)
+                return response
+            finally:
+                name, locator = tracer._describe(driver_command, params)
+                tracer.span(name, "command", start, locator=locator, error=error)
+        return execute
+
+    def _traced_wait(self, original, kind):
+        tracer = self
+
+        from selenium.common.exceptions import TimeoutException
+
+        def until(wait, method, message=""):
+            polls = [0]
+
+            def counted(driver):
+                polls[0] += 1
+                return method(driver)
+            start = _now_us()
+            timed_out = None
+            try:
+                return original(wait, counted, message)
+            except TimeoutException:
+                timed_out = True
+                raise
+            finally:
+                tracer.span(f"{kind} {condition_name(method)}", "wait", start, locator=_condition_locator(method),
+                            polls=polls[0], retries=max(polls[0] - 1, 0), timeout=timed_out)
+        return until
+
+    def _describe(self, driver_command, params):
+        # Команда и то, к чему она относится: локатор поиска, локатор найденного ранее
+        # элемента, начало скрипта или имя команды CDP
+        params = params or {}
+        if "using" in params and "value" in params:
+            return driver_command, _format_locator(params["using"], params["value"])
+        if "script" in params:
+            script = " ".join(str(params["script"]).split())
+            return driver_command, script[:SCRIPT_LABEL_LENGTH]
+        if "cmd" in params:
+            return f"{driver_command} {params['cmd']}", None
+        element_id = params.get("id")
+        if element_id is not None:
+            return driver_command, self._element_locator(element_id)
+        return driver_command, None
+
+    def _remember_elements(self, driver_command, params, response):
+        from selenium.webdriver.remote.webelement import WebElement
+        if not params or "using" not in params or not isinstance(response, dict):
+            return
+        value = response.get("value")
+        elements = value if isinstance(value, list) else [value]
+        locator = _format_locator(params["using"], params["value"])
+        for element in elements:
+            if isinstance(element, WebElement):
+                with self._lock:
+                    self._elements[element.id] = locator
+                    self._elements.move_to_end(element.id)
+                    while len(self._elements) > ELEMENT_LOCATORS:
+                        self._elements.popitem(last=False)
+
+    def _element_locator(self, element_id):
+        with self._lock:
+            locator = self._elements.get(element_id)
+            if locator is None:
+                return "element"
+            self._elements.move_to_end(element_id)
+            return locator
+
+
+class TracePlugin:
+    # Спаны фазы теста уходят в user_properties её отчёта, поэтому под xdist
+    # контроллер собирает трейс всех воркеров так же, как perf_plugin - замеры
+
+    def __init__(self, config):
+        self.config = config
+        self.tracer = Tracer()
+        self.spans = []
+        self.report = None
+
+    def pytest_sessionstart(self, session):
+        self.tracer.install()
+
+    def pytest_unconfigure(self, config):
+        self.tracer.uninstall()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        yield from self._phase(item, "setup")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        yield from self._phase(item, "call")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        yield from self._phase(item, "teardown")
+
+    def _phase(self, item, when):
+        self.tracer.test = item.nodeid
+        start = _now_us()
+        try:
+            yield
+        finally:
+            self.tracer.span(f"{when} {item.name}", "test", start)
+            self.tracer.test = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        outcome.get_result().user_properties.append((TRACE_PROPERTY, self.tracer.drain()))
+
+    def pytest_runtest_logreport(self, report):
+        for name, value in report.user_properties:
+            if name == TRACE_PROPERTY:
+                self.spans.extend(value)
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(self.config, "workerinput"):
+            return
+        # Команды вне тестов: запуск браузеров сессионными фикстурами после последнего теста
+        self.spans.extend(self.tracer.drain())
+        if not self.spans:
+            return
+        directory = self.config.getoption("perf_dir")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "trace.json"), "w", encoding="utf-8") as f:
+            json.dump(chrome_trace(self.spans), f, ensure_ascii=False)
+        self.report = aggregate(self.spans)
+        with open(os.path.join(directory, "trace-report.json"), "w", encoding="utf-8") as f:
+            json.dump(self.report, f, indent=2, ensure_ascii=False)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.report is None:
+            return
+        directory = self.config.getoption("perf_dir")
+        terminalreporter.write_sep("-", "webdriver trace")
+        terminalreporter.write_line(f"{len(self.spans)} spans in {directory}/trace.json, report in {directory}/trace-report.json")
+        terminalreporter.write_line("slowest locators (total ms, count, p95 ms):")
+        for row in self.report["locators"][:SUMMARY_TOP]:
+            terminalreporter.write_line(f"  {row['total_ms']:>9.1f} {row['count']:>6} {row['p95_ms']:>8.1f}  {row['locator']}")
+        terminalreporter.write_line("most waited conditions (total ms, waits, polls, timeouts):")
+        for row in self.report["conditions"][:SUMMARY_TOP]:
+            terminalreporter.write_line(f"  {row['total_ms']:>9.1f} {row['count']:>6} {row['polls']:>6} {row['timeouts']:>4}  "
+                                        f"{row['condition']} {row['locator'] or ''}")
+
+
+def chrome_trace(spans):
+    # Trace Event Format: "X" - законченный спан, "M" - подписи процессов (воркеров xdist)
+    events = []
+    workers = {}
+    for span in spans:
+        workers[span["pid"]] = span["worker"]
+        args = dict(span["args"])
+        if span["test"]:
+            args["test"] = span["test"]
+        events.append({"name": span["name"], "cat": span["cat"], "ph": "X", "ts": span["ts"], "dur": span["dur"],
+                       "pid": span["pid"], "tid": span["tid"], "args": args})
+    for pid, worker in workers.items():
+        events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": worker}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def aggregate(spans, top=REPORT_TOP):
+    locators = defaultdict(list)
+    commands = defaultdict(list)
+    conditions = defaultdict(lambda: {"durations": [], "polls": 0, "timeouts": 0, "tests": set()})
+    for span in spans:
+        duration_ms = span["dur"] / 1000
+        args = span["args"]
+        if span["cat"] == "command":
+            commands[span["name"]].append(duration_ms)
+            if args.get("locator"):
+                locators[(args["locator"], span["name"])].append(duration_ms)
+        elif span["cat"] == "wait":
+            condition = conditions[(span["name"], args.get("locator"))]
+            condition["durations"].append(duration_ms)
+            condition["polls"] += args.get("polls", 0)
+            condition["timeouts"] += bool(args.get("timeout"))
+            if span["test"]:
+                condition["tests"].add(span["test"])
+
+    def timing(durations):
+        summary = perf_stats.summarize(durations)
+        return {"count": summary["count"], "total_ms": sum(durations), "mean_ms": summary["mean"],
+                "p95_ms": summary["p95"], "max_ms": summary["max"]}
+
+    locator_rows = [dict(timing(durations), locator=locator, command=command)
+                    for (locator, command), durations in locators.items()]
+    command_rows = [dict(timing(durations), command=command) for command, durations in commands.items()]
+    condition_rows = [dict(timing(value["durations"]), condition=name, locator=locator, polls=value["polls"],
+                           timeouts=value["timeouts"], tests=len(value["tests"]))
+                      for (name, locator), value in conditions.items()]
+    for rows in (locator_rows, command_rows, condition_rows):
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+    return {"locators": locator_rows[:top], "commands": command_rows[:top], "conditions": condition_rows[:top]}
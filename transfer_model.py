@@ -0,0 +1,148 @@
+# Эталонная модель расчётов перевода.
+# app_* повторяют собранный бандл (assets/index-*.js), spec_* - ожидания тест-кейсов
+import math
+import re
+
+import numpy as np
+
+COMMISSION_STEP = 100
+COMMISSION_PER_STEP = 10
+
+_GROUPING_RE = re.compile(r"\B(?=(\d{3})+(?!\d))")
+_JS_DECIMAL_RE = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?")
+_JS_PREFIXED_RE = re.compile(r"0([xX][0-9a-fA-F]+|[oO][0-7]+|[bB][01]+)")
+_JS_INFINITY_RE = re.compile(r"[+-]?Infinity")
+_JS_RADIX = {"x": 16, "o": 8, "b": 2}
+
+
+def app_commission(amount):
+    # Math.floor(amount / 100) * 10
+    return math.floor(amount / COMMISSION_STEP) * COMMISSION_PER_STEP
+
+
+def app_can_transfer(balance, reserved, amount):
+    # balance - reserved - commission - amount > 0
+    return balance - reserved - app_commission(amount) - amount > 0
+
+
+def spec_commission(amount):
+    # TC-008 / Bug-002: 10% с округлением вниз (55 -> 5, 199 -> 19)
+    return math.floor(amount / 10)
+
+
+def spec_can_transfer(balance, reserved, amount):
+    # TC-009: сумма с комиссией может быть равна доступной; Bug-004/005: сумма > 0
+    return amount > 0 and balance - reserved - spec_commission(amount) - amount >= 0
+
+
+def js_number(text):
+    # Number(string): пустая строка - 0, всё нечисловое - NaN
+    text = text.strip()
+    if text == "":
+        return 0
+    if _JS_INFINITY_RE.fullmatch(text):
+        return -math.inf if text.startswith("-") else math.inf
+    if _JS_PREFIXED_RE.fullmatch(text):
+        return int(text[2:], _JS_RADIX[text[1].lower()])
+    if _JS_DECIMAL_RE.fullmatch(text):
+        value = float(text)
+        return int(value) if value.is_integer() and "e" not in text.lower() and "." not in text else value
+    return math.nan
+
+
+def app_query_number(raw):
+    # Number(params.get("balance") || "0"): отсутствующий (None) или пустой параметр - 0
+    return js_number(raw or "0")
+
+
+def spec_query_number(raw):
+    # Bug-003: некорректное значение параметра должно превращаться в 0, а не в NaN
+    value = app_query_number(raw)
+    return 0 if isinstance(value, float) and not math.isfinite(value) else value
+
+
+def js_number_to_string(value):
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "Infinity" if value > 0 else "-Infinity"
+        if value.is_integer() and abs(value) < 1e21:
+            return str(int(value))
+        return repr(value)
+    return str(value)
+
+
+def format_balance(value):
+    # value.toString().replace(/\B(?=(\d{3})+(?!\d))/g, "'")
+    return _GROUPING_RE.sub("'", js_number_to_string(value))
+
+
+def app_commission_vec(amount):
+    return np.floor_divide(amount, COMMISSION_STEP) * COMMISSION_PER_STEP
+
+
+def spec_commission_vec(amount):
+    return np.floor_divide(amount, 10)
+
+
+def sweep(count=1_000_000, max_value=1_000_000, seed=0):
+    # Случайные тройки (balance, reserved, amount) плюс сетка вокруг шагов комиссии
+    rng = np.random.default_rng(seed)
+    balance = rng.integers(0, max_value, count, dtype=np.int64)
+    reserved = rng.integers(0, max_value, count, dtype=np.int64) % (balance + 1)
+    amount = rng.integers(0, max_value, count, dtype=np.int64)
+
+    # Ставим часть сумм ровно на границу доступного остатка, иначе они почти не встречаются
+    edge = slice(0, count // 4)
+    available = balance[edge] - reserved[edge]
+    amount[edge] = np.maximum(available * 10 // 11 + rng.integers(-2, 3, available.size), 0)
+
+    steps = np.arange(0, 2 * COMMISSION_STEP, dtype=np.int64)
+    balance = np.concatenate([balance, np.full(steps.size, 10000, dtype=np.int64)])
+    reserved = np.concatenate([reserved, np.zeros(steps.size, dtype=np.int64)])
+    amount = np.concatenate([amount, steps])
+    return evaluate(balance, reserved, amount)
+
+
+def evaluate(balance, reserved, amount):
+    app_fee = app_commission_vec(amount)
+    spec_fee = spec_commission_vec(amount)
+    app_margin = balance - reserved - app_fee - amount
+    spec_margin = balance - reserved - spec_fee - amount
+    app_ok = app_margin > 0
+    spec_ok = (amount > 0) & (spec_margin >= 0)
+    return {
+        "balance": balance,
+        "reserved": reserved,
+        "amount": amount,
+        "app_commission": app_fee,
+        "app_can_transfer": app_ok,
+        "kinds": {
+            "commission_mismatch": app_fee != spec_fee,
+            "availability_mismatch": app_ok != spec_ok,
+            "non_positive_amount": (amount <= 0) & app_ok,
+            "exact_balance": app_margin == 0,
+            "one_left": app_margin == 1,
+        },
+    }
+
+
+def representative_points(result, per_kind=3):
+    # Для медленной проверки в браузере: минимум, медиана и максимум суммы по каждому виду
+    points = []
+    for kind, mask in result["kinds"].items():
+        indexes = np.flatnonzero(mask)
+        if indexes.size == 0:
+            continue
+        indexes = indexes[np.argsort(result["amount"][indexes], kind="stable")]
+        picks = np.unique(np.linspace(0, indexes.size - 1, per_kind).astype(int))
+        for index in indexes[picks]:
+            point = (
+                int(result["balance"][index]),
+                int(result["reserved"][index]),
+                int(result["amount"][index]),
+            )
+            if point not in points:
+                points.append(point)
+    return points
@@ -0,0 +1,211 @@
+# Визуальная регрессия: скриншот режется на тайлы, для каждого тайла хранится
+# перцептивный хеш (8x8 бит) и средний цвет. Новый снимок сравнивается с индексом
+# векторно по всем тайлам; попиксельное сравнение - только если хеши разошлись
+import base64
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow нужен только визуальным тестам
+    Image = None
+
+TILE = 64
+HASH_GRID = 8
+# Ячейка хеша "светлая", только если ярче среднего по тайлу на столько уровней: иначе
+# у однотонного тайла один изменившийся пиксель переворачивает почти все биты
+HASH_MARGIN = 2.0
+# Тайл считается изменившимся, если разошлось больше бит хеша или средний цвет сдвинулся сильнее
+MAX_HASH_DISTANCE = 3
+MAX_MEAN_DELTA = 4
+# Попиксельно: разница канала до PIXEL_TOLERANCE - шум сглаживания, доля изменившихся пикселей до MAX_CHANGED_RATIO
+PIXEL_TOLERANCE = 16
+MAX_CHANGED_RATIO = 0.0005
+DIGEST_LENGTH = 16
+
+
+def _require_pillow():
+    if Image is None:
+        raise RuntimeError("Visual regression requires the 'Pillow' package")
+
+
+def decode_png(data):
+    _require_pillow()
+    with Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def encode_png(pixels):
+    _require_pillow()
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def capture(driver, width, height, load):
+    # Размер вьюпорта задаётся эмуляцией, а не размером окна: у окна есть рамка,
+    # и у headless Chrome итоговый вьюпорт зависит от версии. load() открывает страницу
+    metrics = {"width": width, "height": height, "deviceScaleFactor": 1, "mobile": width < 768}
+    driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", metrics)
+    try:
+        load()
+        shot = driver.execute_cdp_cmd("Page.captureScreenshot", {"format": "png", "captureBeyondViewport": False})
+    finally:
+        driver.execute_cdp_cmd("Emulation.clearDeviceMetricsOverride", {})
+    return decode_png(base64.b64decode(shot["data"]))
+
+
+def to_tiles(pixels):
+    # (H, W, 3) -> (rows, cols, TILE, TILE, 3); край дополняется чёрным до целого тайла
+    height, width = pixels.shape[:2]
+    rows, cols = -(-height // TILE), -(-width // TILE)
+    padded = np.zeros((rows * TILE, cols * TILE, 3), dtype=np.uint8)
+    padded[:height, :width] = pixels
+    return padded.reshape(rows, TILE, cols, TILE, 3).swapaxes(1, 2)
+
+
+def from_tiles(tiles, height, width):
+    rows, cols = tiles.shape[:2]
+    return tiles.swapaxes(1, 2).reshape(rows * TILE, cols * TILE, 3)[:height, :width]
+
+
+def signature(tiles):
+    # Average hash: яркость тайла усредняется в сетку 8x8, бит - ячейка заметно ярче среднего по тайлу.
+    # Всё одной операцией над массивом тайлов, без цикла по ним
+    rows, cols = tiles.shape[:2]
+    cell = TILE // HASH_GRID
+    luma = tiles.astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    grid = luma.reshape(rows, cols, HASH_GRID, cell, HASH_GRID, cell).mean(axis=(3, 5)).reshape(rows, cols, -1)
+    bits = grid > grid.mean(axis=2, keepdims=True) + HASH_MARGIN
+    hashes = np.packbits(bits, axis=2).view(">u8")[..., 0]
+    means = tiles.reshape(rows, cols, -1, 3).mean(axis=2).round().astype(np.uint8)
+    return hashes, means
+
+
+def hash_distance(left, right):
+    # Расстояние Хэмминга для всех тайлов сразу
+    xor = np.bitwise_xor(left, right).astype(">u8")
+    return np.unpackbits(xor.view(np.uint8).reshape(xor.shape + (8,)), axis=-1).sum(axis=-1)
+
+
+def diverged_tiles(baseline, actual):
+    (base_hashes, base_means), (hashes, means) = baseline, actual
+    mean_delta = np.abs(base_means.astype(np.int16) - means).max(axis=2)
+    return (hash_distance(base_hashes, hashes) > MAX_HASH_DISTANCE) | (mean_delta > MAX_MEAN_DELTA)
+
+
+def _pack(array):
+    return base64.b64encode(np.ascontiguousarray(array).tobytes()).decode("ascii")
+
+
+def _unpack(text, dtype, shape):
+    return np.frombuffer(base64.b64decode(text), dtype=dtype).reshape(shape)
+
+
+class VisualIndex:
+    # entries/<key>.json - размеры, хеши, средние цвета и раскладка тайлов (~4 КБ на снимок);
+    # tiles/<digest>.png - сами тайлы по хешу содержимого. Фон, шапка и карточки совпадают
+    # у многих комбинаций, поэтому тайлы хранятся один раз на весь индекс.
+    # Каждая запись - отдельный файл: воркеры xdist пишут в индекс параллельно без блокировок
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.entries_dir = os.path.join(directory, "entries")
+        self.tiles_dir = os.path.join(directory, "tiles")
+
+    def get(self, key):
+        path = os.path.join(self.entries_dir, f"{key}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+        rows, cols = entry["rows"], entry["cols"]
+        entry["hashes"] = _unpack(entry["hashes"], ">u8", (rows, cols))
+        entry["means"] = _unpack(entry["means"], np.uint8, (rows, cols, 3))
+        entry["layout"] = _unpack(entry["layout"], "<u2", (rows, cols))
+        return entry
+
+    def put(self, key, pixels):
+        os.makedirs(self.entries_dir, exist_ok=True)
+        os.makedirs(self.tiles_dir, exist_ok=True)
+        tiles = to_tiles(pixels)
+        rows, cols = tiles.shape[:2]
+        hashes, means = signature(tiles)
+        positions = {}
+        layout = np.zeros((rows, cols), dtype="<u2")
+        for row in range(rows):
+            for col in range(cols):
+                tile = np.ascontiguousarray(tiles[row, col])
+                digest = hashlib.sha256(tile.tobytes()).hexdigest()[:DIGEST_LENGTH]
+                if digest not in positions:
+                    positions[digest] = len(positions)
+                    self._write_tile(digest, tile)
+                layout[row, col] = positions[digest]
+        entry = {
+            "height": pixels.shape[0],
+            "width": pixels.shape[1],
+            "rows": rows,
+            "cols": cols,
+            "hashes": _pack(hashes),
+            "means": _pack(means),
+            "tiles": list(positions),
+            "layout": _pack(layout),
+        }
+        with open(os.path.join(self.entries_dir, f"{key}.json"), "w", encoding="utf-8") as f:
+            json.dump(entry, f, separators=(",", ":"))
+
+    def load_pixels(self, entry):
+        blobs = {}
+        for digest in entry["tiles"]:
+            with open(os.path.join(self.tiles_dir, f"{digest}.png"), "rb") as f:
+                blobs[digest] = decode_png(f.read())
+        stack = np.stack([blobs[digest] for digest in entry["tiles"]])
+        return from_tiles(stack[entry["layout"]], entry["height"], entry["width"])
+
+    def _write_tile(self, digest, tile):
+        path = os.path.join(self.tiles_dir, f"{digest}.png")
+        if os.path.exists(path):
+            return
+        # Сначала во временный файл: параллельный читатель не увидит половину PNG
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(encode_png(tile))
+        os.replace(temporary, path)
+
+
+def compare(index, entry, pixels):
+    height, width = pixels.shape[:2]
+    if (entry["height"], entry["width"]) != (height, width):
+        return {"match": False, "reason": f"size {width}x{height}, baseline {entry['width']}x{entry['height']}",
+                "tiles": [], "changed_ratio": 1.0}
+    diverged = diverged_tiles((entry["hashes"], entry["means"]), signature(to_tiles(pixels)))
+    tiles = [[int(row), int(col)] for row, col in np.argwhere(diverged)]
+    if not tiles:
+        return {"match": True, "reason": "hashes", "tiles": [], "changed_ratio": 0.0}
+    baseline = index.load_pixels(entry)
+    changed = np.abs(baseline.astype(np.int16) - pixels).max(axis=2) > PIXEL_TOLERANCE
+    ratio = float(changed.mean())
+    return {
+        "match": ratio <= MAX_CHANGED_RATIO,
+        "reason": "pixels",
+        "tiles": tiles,
+        "changed_ratio": ratio,
+        "baseline": baseline,
+        "changed": changed,
+    }
+
+
+def write_diff(directory, key, pixels, result):
+    # Артефакт для разбора: эталон | текущий снимок | изменившиеся пиксели красным поверх текущего
+    os.makedirs(directory, exist_ok=True)
+    highlight = pixels.copy()
+    highlight[result["changed"]] = (255, 0, 0)
+    combined = np.concatenate([result["baseline"], pixels, highlight], axis=1)
+    path = os.path.join(directory, f"{key}-diff.png")
+    with open(path, "wb") as f:
+        f.write(encode_png(combined))
+    return path
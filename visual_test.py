@@ -0,0 +1,74 @@
+# Visual regression over a matrix of viewports and balance/reserved values
+import os
+import numpy as np
+import pytest
+from selenium.webdriver.support.ui import WebDriverWait
+import visual_regression
+from pages import DashboardPage
+from waits import wait_for_render
+
+VIEWPORTS = ((375, 667), (414, 896), (768, 1024), (1280, 720), (1920, 1080))
+# Обычный счёт, пустой, крупные суммы с разделителями разрядов и BUG-003 (NaN)
+BALANCES = ((30000, 20001), (0, 0), (999999, 0), (1234567, 1000000), ("abc", "xyz"))
+DIFF_DIR = os.path.join("test-results", "visual")
+
+
+def _key(width, height, balance, reserved):
+    return f"{width}x{height}-b{balance}-r{reserved}"
+
+
+def test_index_round_trip_and_compare(tmp_path):
+    # Без браузера: индекс хранит снимок без потерь, мелкий шум проходит по хешам,
+    # заметная правка находится в своих тайлах и подтверждается попиксельно
+    pixels = np.full((667, 375, 3), 245, dtype=np.uint8)
+    pixels[40:80, 20:300] = (30, 30, 200)
+    index = visual_regression.VisualIndex(str(tmp_path))
+    index.put("card", pixels)
+    entry = index.get("card")
+    assert (index.load_pixels(entry) == pixels).all()
+    assert len(entry["tiles"]) < entry["rows"] * entry["cols"]
+
+    noisy = pixels.copy()
+    noisy[300, 300] = (0, 0, 0)
+    assert visual_regression.compare(index, entry, noisy)["reason"] == "hashes"
+
+    changed = pixels.copy()
+    changed[80:120, 140:180] = (0, 0, 0)
+    result = visual_regression.compare(index, entry, changed)
+    assert not result["match"]
+    assert result["tiles"] == [[1, 2]]
+
+
+@pytest.fixture(scope="session")
+def visual_index(request):
+    return visual_regression.VisualIndex(request.config.getoption("visual_baseline"))
+
+
+@pytest.mark.parametrize("balance,reserved", BALANCES, ids=[f"{b}-{r}" for b, r in BALANCES])
+@pytest.mark.parametrize("width,height", VIEWPORTS, ids=[f"{w}x{h}" for w, h in VIEWPORTS])
+def test_layout_matches_baseline(width, height, balance, reserved, pooled_driver, base_url, visual_index, request):
+    page = DashboardPage(pooled_driver, WebDriverWait(pooled_driver, 10), base_url)
+
+    def load():
+        page.open(balance=balance, reserved=reserved)
+        wait_for_render(pooled_driver)
+
+    pixels = visual_regression.capture(pooled_driver, width, height, load)
+    key = _key(width, height, balance, reserved)
+    if request.config.getoption("visual_update"):
+        visual_index.put(key, pixels)
+        return
+    entry = visual_index.get(key)
+    if entry is None:
+        pytest.skip(f"no visual baseline for {key}, record it with --visual-update")
+    result = visual_regression.compare(visual_index, entry, pixels)
+    if not result["match"]:
+        message = (f"{key} differs from baseline ({result['reason']}): tiles {result['tiles']}, "
+                   f"{result['changed_ratio']:.4%} pixels changed")
+        if "changed" in result:
+            message += f", diff in {visual_regression.write_diff(DIFF_DIR, key, pixels, result)}"
+        pytest.fail(message)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,60 @@
+# Общие условия ожидания для автотестов вместо фиксированных time.sleep()
+from selenium.common.exceptions import NoAlertPresentException
+from selenium.webdriver.common.by import By
+
+RUB_SUM = (By.ID, "rub-sum")
+COMMISSION = (By.ID, "comission")
+
+# Один round trip на опрос: #root смонтирован и карточка рублей отрисована
+_APP_MOUNTED_JS = """
+const root = document.getElementById('root');
+if (!root || root.childElementCount === 0) { return null; }
+return document.getElementById('rub-sum');
+"""
+
+# Два кадра подряд: React 18 к этому моменту успевает закоммитить обновление
+_NEXT_FRAMES_JS = """
+const done = arguments[arguments.length - 1];
+requestAnimationFrame(() => requestAnimationFrame(() => done(true)));
+"""
+
+
+def app_mounted():
+    def _predicate(driver):
+        return driver.execute_script(_APP_MOUNTED_JS) or False
+    return _predicate
+
+
+def text_changed(locator, previous):
+    def _predicate(driver):
+        elements = driver.find_elements(*locator)
+        if not elements:
+            return False
+        text = elements[0].text
+        return text if text != previous else False
+    return _predicate
+
+
+def alert_present():
+    def _predicate(driver):
+        try:
+            return driver.switch_to.alert
+        except NoAlertPresentException:
+            return False
+    return _predicate
+
+
+def open_app(driver, wait, url):
+    driver.get(url)
+    return wait.until(app_mounted())
+
+
+def wait_for_render(driver):
+    driver.execute_async_script(_NEXT_FRAMES_JS)
+
+
+def dismiss_alert(driver):
+    try:
+        driver.switch_to.alert.accept()
+    except NoAlertPresentException:
+        pass